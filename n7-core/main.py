@@ -5,6 +5,14 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import asyncio
 import logging
 from typing import Dict, Any
+from google.protobuf.internal import api_implementation
+
+try:
+    # libuv-based event loop: faster socket and timer handling for NATS, asyncpg, asyncssh
+    import uvloop
+except ImportError:
+    uvloop = None
+
 from n7_core.messaging.nats_client import nats_client
 from n7_core.service_manager.service_manager import ServiceManager
 from n7_core.event_pipeline.service import EventPipelineService
@@ -21,7 +29,8 @@ from n7_core.playbooks.service import PlaybookEngineService
 from n7_core.notifier.service import NotifierService
 from n7_core.deployment.service import DeploymentService
 from n7_core.utils import print_banner
-from n7_core.config import settings
+from n7_core.config import get_settings
+from n7_core.database.session import prewarm_pool
 from n7_core.api_gateway.service import register_llm_analyzer
 
 # Configure logging
@@ -37,6 +46,15 @@ async def main():
     print_banner("N7-Core")
     logger.info("Starting N7-Core...")
 
+    # Every NATS message is a protobuf parse; the pure-Python backend is an order
+    # of magnitude slower than the native (upb/cpp) one.
+    protobuf_backend = api_implementation.Type()
+    if protobuf_backend == "python":
+        logger.warning("protobuf is using the pure-Python backend; install protobuf>=6.31.1 for the native parser")
+    else:
+        logger.info(f"protobuf backend: {protobuf_backend}")
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
+
     # Initialize Service Manager
     service_manager = ServiceManager()
 
@@ -47,6 +65,9 @@ async def main():
         logger.error(f"Failed to connect to NATS during startup: {e}")
         # Proceeding — services handle NATS absence gracefully
 
+    # Open DB connections before services start taking traffic
+    await prewarm_pool()
+
     # ----------------------------------------------------------------
     # Build services with dependency injection
     # (order matters: dependencies constructed before dependents)
@@ -100,6 +121,7 @@ async def main():
             "Startup check: LLM (Ollama) is ACTIVE — enriched narratives enabled."
         )
     else:
+        settings = get_settings()
         logger.warning(
             "Startup check: LLM (Ollama) is UNREACHABLE — "
             "alert narratives will use rule-based fallback until Ollama recovers. "
@@ -122,6 +144,9 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main())
+        else:
+            asyncio.run(main())
     except KeyboardInterrupt:
         logger.info("N7-Core stopped by user.")
@@ -0,0 +1,45 @@
+"""add timestamp_ns to audit_log
+
+Adds an integer epoch-nanosecond timestamp to the audit log.
+
+AuditLoggerService now hashes and orders the chain by timestamp_ns
+(time.time_ns()) instead of formatting datetime.utcnow().isoformat() on every
+write. The existing `timestamp` column is kept for human-readable queries.
+
+Existing rows are backfilled from `timestamp`; verify_hash_chain() still
+accepts the legacy ISO-timestamp hash form for those rows.
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-16 00:00:00.000000
+
+Ref: SRS FR-C040, FR-C041, FR-C042
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add as nullable first so existing rows don't violate NOT NULL
+    op.add_column('audit_log', sa.Column('timestamp_ns', sa.BigInteger(), nullable=True))
+    # Backfill from the existing datetime column
+    op.execute(
+        "UPDATE audit_log "
+        "SET timestamp_ns = (EXTRACT(EPOCH FROM timestamp) * 1000000000)::bigint "
+        "WHERE timestamp_ns IS NULL"
+    )
+    op.alter_column('audit_log', 'timestamp_ns', nullable=False)
+    op.create_index(op.f('ix_audit_log_timestamp_ns'), 'audit_log', ['timestamp_ns'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_audit_log_timestamp_ns'), table_name='audit_log')
+    op.drop_column('audit_log', 'timestamp_ns')
@@ -0,0 +1,52 @@
+"""add covering index to agent_configs
+
+Replaces the plain unique index on agent_configs.agent_id with a unique
+covering index that INCLUDEs the hot scalar columns read on every agent
+config poll (nats_url_enc, core_api_url_enc, config_version, log_level,
+environment, zone), so PostgreSQL can answer those lookups with an
+index-only scan instead of a heap fetch.
+
+Uniqueness on agent_id is preserved — ConfigSyncService relies on it for
+INSERT ... ON CONFLICT (agent_id).
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-16 00:00:00.000000
+
+Ref: TDD Section 5.x Agent Configuration Management
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COVERED_COLUMNS = [
+    'nats_url_enc', 'core_api_url_enc', 'config_version',
+    'log_level', 'environment', 'zone',
+]
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_agent_configs_agent_id_cover',
+        'agent_configs',
+        ['agent_id'],
+        unique=True,
+        postgresql_include=_COVERED_COLUMNS,
+    )
+    op.drop_index(op.f('ix_agent_configs_agent_id'), table_name='agent_configs')
+
+
+def downgrade() -> None:
+    op.create_index(
+        op.f('ix_agent_configs_agent_id'),
+        'agent_configs',
+        ['agent_id'],
+        unique=True,
+    )
+    op.drop_index('ix_agent_configs_agent_id_cover', table_name='agent_configs')
@@ -0,0 +1,42 @@
+"""server-side timestamp defaults
+
+created_at / updated_at (and agent_configs.updated_at) are now filled by
+PostgreSQL — timezone('utc', now()) — instead of datetime.utcnow() on every
+ORM write, so the columns need a server default for inserts that no longer
+send a value.
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-16 00:00:00.000000
+
+Ref: TDD Section 4.5 Data Architecture
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_UTC_NOW = sa.text("timezone('utc', now())")
+
+# Tables using TimestampMixin (created_at + updated_at)
+_TIMESTAMPED_TABLES = ['agents', 'alerts', 'actions', 'incidents', 'users', 'infra_nodes']
+
+
+def upgrade() -> None:
+    for table in _TIMESTAMPED_TABLES:
+        op.alter_column(table, 'created_at', server_default=_UTC_NOW)
+        op.alter_column(table, 'updated_at', server_default=_UTC_NOW)
+    op.alter_column('agent_configs', 'updated_at', server_default=_UTC_NOW)
+
+
+def downgrade() -> None:
+    op.alter_column('agent_configs', 'updated_at', server_default=None)
+    for table in _TIMESTAMPED_TABLES:
+        op.alter_column(table, 'updated_at', server_default=None)
+        op.alter_column(table, 'created_at', server_default=None)
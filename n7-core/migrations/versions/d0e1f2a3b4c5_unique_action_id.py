@@ -0,0 +1,29 @@
+"""unique index on actions.action_id
+
+Status reports for actions first seen by a decision engine are written with
+INSERT ... ON CONFLICT (action_id) DO UPDATE, which needs a unique index on
+action_id (the primary key is the composite (action_id, id)).
+
+Revision ID: d0e1f2a3b4c5
+Revises: c9d0e1f2a3b4
+Create Date: 2026-10-16 00:00:00.000000
+
+Ref: TDD Section 9.1.4 Action Data Model
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd0e1f2a3b4c5'
+down_revision: Union[str, None] = 'c9d0e1f2a3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_actions_action_id'), 'actions', ['action_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_actions_action_id'), table_name='actions')
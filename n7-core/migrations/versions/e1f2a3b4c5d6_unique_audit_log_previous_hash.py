@@ -0,0 +1,37 @@
+"""unique index on audit_log.previous_hash
+
+Each audit entry may have only one successor. Without this, two processes
+appending from the same cached chain head both succeed and the chain forks
+silently; with it, the second INSERT fails and AuditLoggerService re-reads the
+head under a row lock and chains again. previous_hash is coalesced so that a
+second genesis entry (previous_hash NULL) is rejected too.
+
+Revision ID: e1f2a3b4c5d6
+Revises: d0e1f2a3b4c5
+Create Date: 2026-10-16 00:00:00.000000
+
+Ref: SRS FR-C040, FR-C041, FR-C042
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1f2a3b4c5d6'
+down_revision: Union[str, None] = 'd0e1f2a3b4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'uq_audit_log_previous_hash',
+        'audit_log',
+        [sa.text("coalesce(previous_hash, '')")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_audit_log_previous_hash', table_name='audit_log')
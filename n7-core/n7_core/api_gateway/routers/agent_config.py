@@ -1,13 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Security, status
+from functools import lru_cache
+
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Response, Security, status
 from fastapi.security import APIKeyHeader
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..auth import get_agent_from_api_key
 from ...config_sync.service import ConfigSyncService
+from ...database.session import get_session
 from ...models.agent import Agent as AgentModel
 
 router = APIRouter(tags=["Agent Config"])
 
-_config_sync = ConfigSyncService()
+# Built on first request so importing the router does not read settings
+@lru_cache(maxsize=1)
+def _config_sync() -> ConfigSyncService:
+    return ConfigSyncService()
 
 # Re-declare the header extractor so we can get the raw key alongside the authenticated agent
 _agent_api_key_header = APIKeyHeader(name="X-Agent-API-Key", auto_error=True)
@@ -18,6 +26,7 @@ async def get_agent_config(
     agent_id: str,
     raw_api_key: str = Security(_agent_api_key_header),
     authenticated_agent: AgentModel = Depends(get_agent_from_api_key),
+    session: AsyncSession = Depends(get_session),
 ):
     """
     Fetch the centralized config for a deployed agent.
@@ -27,8 +36,8 @@ async def get_agent_config(
     Path: GET /api/v1/agent-config/{agent_id}/config
 
     Returns config values where sensitive fields (nats_url_enc, core_api_url_enc)
-    are Fernet-encrypted with a key derived from THIS agent's API key.
-    The agent decrypts them locally using the same derivation: sha256(api_key).
+    are AES-256-GCM-encrypted (see transport_cipher) with a key derived from THIS
+    agent's API key. The agent decrypts them locally using the same derivation: sha256(api_key).
 
     Also returns config_version so the agent can cache and only re-apply on change.
     """
@@ -39,9 +48,12 @@ async def get_agent_config(
             detail="Agents may only retrieve their own configuration.",
         )
 
-    config = await _config_sync.get_config_for_agent(
+    # get_session is resolved once per request, so this is the same session
+    # get_agent_from_api_key authenticated with — no second pool checkout.
+    config = await _config_sync().get_config_for_agent(
         agent_id=authenticated_agent.id,
         api_key=raw_api_key,
+        session=session,
     )
     if config is None:
         raise HTTPException(
@@ -49,4 +61,5 @@ async def get_agent_config(
             detail="No configuration found for this agent. It may not have been provisioned yet.",
         )
 
-    return config
+    # Encode the Struct directly; skips jsonable_encoder and the dict round-trip.
+    return Response(content=msgspec.json.encode(config), media_type="application/json")
@@ -2,6 +2,7 @@ import json
 import logging
 import uuid as _uuid
 from datetime import datetime, timedelta, UTC
+from functools import lru_cache
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Request
@@ -21,7 +22,10 @@ AGENT_STALE_THRESHOLD_SECONDS = 90
 
 logger = logging.getLogger("n7-core.agents-router")
 
-_config_sync = ConfigSyncService()
+# Built on first request so importing the router does not read settings
+@lru_cache(maxsize=1)
+def _config_sync() -> ConfigSyncService:
+    return ConfigSyncService()
 
 
 async def _push_config_to_agent(agent_id: str, cfg) -> None:
@@ -328,7 +332,7 @@ async def update_agent_config(
         raise HTTPException(status_code=422, detail="No fields to update.")
 
     try:
-        updated_cfg = await _config_sync.upsert_config(
+        updated_cfg = await _config_sync().upsert_config(
             agent_id=_uuid.UUID(agent_id),
             config_dict=update_dict,
             agent_type=agent.agent_type,
@@ -388,7 +392,7 @@ async def update_agent(
 
     if config_fields:
         try:
-            updated_cfg = await _config_sync.upsert_config(
+            updated_cfg = await _config_sync().upsert_config(
                 agent_id=_uuid.UUID(agent_id),
                 config_dict=config_fields,
                 agent_type=agent.agent_type,
@@ -1,4 +1,5 @@
 import logging
+from functools import lru_cache
 from typing import List
 from uuid import UUID
 
@@ -17,8 +18,10 @@ logger = logging.getLogger("n7-core.api.deployment")
 
 router = APIRouter(tags=["Deployment"])
 
-# Module-level singleton — shares process lifecycle with the router
-_deployment_service = DeploymentService()
+# Process-wide singleton, built on first request so importing the router does not read settings
+@lru_cache(maxsize=1)
+def _deployment_service() -> DeploymentService:
+    return DeploymentService()
 
 
 @router.post("/scan", response_model=ScanResult)
@@ -29,14 +32,14 @@ async def scan_network(request: ScanRequest):
     """
     try:
         if request.method == "nmap":
-            hosts = await _deployment_service.scan_network_nmap(
+            hosts = await _deployment_service().scan_network_nmap(
                 request.network_cidr, request.timeout_seconds
             )
         else:
-            hosts = await _deployment_service.scan_network_ping(
+            hosts = await _deployment_service().scan_network_ping(
                 request.network_cidr, request.timeout_seconds
             )
-        nodes = await _deployment_service.persist_discovered_nodes(hosts, method=request.method)
+        nodes = await _deployment_service().persist_discovered_nodes(hosts, method=request.method)
         return ScanResult(discovered=len(nodes), nodes=nodes)
     except Exception as e:
         logger.error(f"Scan failed: {e}")
@@ -68,7 +71,7 @@ async def add_node(node_in: InfraNodeCreate):
 
         enc_password = None
         if node_in.ssh_password:
-            enc_password = _deployment_service.encrypt_credential(node_in.ssh_password)
+            enc_password = _deployment_service().encrypt_credential(node_in.ssh_password)
 
         node = InfraNodeModel(
             ip_address=node_in.ip_address,
@@ -100,10 +103,7 @@ async def update_node(
     User-authenticated. Does NOT re-deploy; only updates the stored node record.
     """
     async with async_session_maker() as session:
-        result = await session.execute(
-            select(InfraNodeModel).where(InfraNodeModel.id == node_id)
-        )
-        node = result.scalar_one_or_none()
+        node = await session.get(InfraNodeModel, node_id)
         if not node:
             raise HTTPException(status_code=404, detail="Node not found")
 
@@ -118,7 +118,7 @@ async def update_node(
         if node_update.ssh_username is not None:
             node.ssh_username = node_update.ssh_username
         if node_update.ssh_password is not None:
-            node.ssh_password_enc = _deployment_service.encrypt_credential(node_update.ssh_password)
+            node.ssh_password_enc = _deployment_service().encrypt_credential(node_update.ssh_password)
         if node_update.ssh_key_path is not None:
             node.ssh_key_path = node_update.ssh_key_path
 
@@ -139,10 +139,7 @@ async def deploy_agent(
     Poll GET /api/v1/deployment/nodes to observe deployment_status changes.
     """
     async with async_session_maker() as session:
-        result = await session.execute(
-            select(InfraNodeModel).where(InfraNodeModel.id == node_id)
-        )
-        node = result.scalar_one_or_none()
+        node = await session.get(InfraNodeModel, node_id)
         if not node:
             raise HTTPException(status_code=404, detail="Node not found")
         if node.deployment_status in ("pending", "in_progress"):
@@ -152,7 +149,7 @@ async def deploy_agent(
         await session.commit()
 
     background_tasks.add_task(
-        _deployment_service.deploy_agent,
+        _deployment_service().deploy_agent,
         node_id=str(node_id),
         agent_type=request.agent_type,
         agent_subtype=request.agent_subtype,
@@ -5,7 +5,7 @@ Ref: TDD Section 4.X TI Fetcher, SRS FR-C011
 """
 from fastapi import APIRouter
 
-from ...database.redis import redis_client
+from ...database.redis import get_redis_client
 
 router = APIRouter(tags=["Threat Intelligence"])
 
@@ -21,7 +21,7 @@ async def get_ti_stats():
     try:
         cursor = 0
         while True:
-            cursor, keys = await redis_client.scan(cursor, match="n7:ioc:*", count=1000)
+            cursor, keys = await get_redis_client().scan(cursor, match="n7:ioc:*", count=1000)
             for key in keys:
                 # Key format: n7:ioc:{type}:{value}
                 parts = key.split(":", 3)
@@ -48,7 +48,7 @@ async def lookup_ioc(ioc_type: str, ioc_value: str):
     """
     import json
     key = f"n7:ioc:{ioc_type}:{ioc_value}"
-    cached = await redis_client.get(key)
+    cached = await get_redis_client().get(key)
     if cached:
         return {"found": True, "ioc": json.loads(cached)}
     return {"found": False, "ioc_type": ioc_type, "ioc_value": ioc_value}
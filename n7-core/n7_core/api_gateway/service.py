@@ -1,26 +1,48 @@
 import asyncio
 import logging
+import socket
 from typing import Optional, TYPE_CHECKING
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
+import orjson
+from fastapi import FastAPI, Response
 from uvicorn import Config, Server
 
 # Import Routers
 from .routers import auth, users, agents, events, deployment, alerts, threat_intel
 from .routers import agent_config
-from ..config import settings
+from .middleware import FastCORSMiddleware
+from ..config import get_settings
 from ..service_manager.base_service import BaseService
 
 if TYPE_CHECKING:
     from ..llm_analyzer.service import LLMAnalyzerService
 
+__all__ = ["app", "APIGatewayService", "register_llm_analyzer"]
+
 logger = logging.getLogger("n7-core.api-gateway")
 
 # Module-level reference set by main.py after LLMAnalyzerService is started.
 # Used by the /health endpoint to report live LLM status without circular imports.
 _llm_analyzer_ref: Optional["LLMAnalyzerService"] = None
 
+# Last LLM health result, refreshed by APIGatewayService._poll_llm_health so that
+# /health never waits on Ollama (liveness probes would otherwise time out with it).
+_LLM_HEALTH_POLL_INTERVAL = 5  # seconds
+_llm_status: str = "unknown"
+
+
+def _health_body(llm_status: str) -> bytes:
+    overall = "ok" if llm_status in ("ok", "unknown") else "degraded"
+    return orjson.dumps({
+        "status": overall,
+        "components": {
+            "llm_analyzer": llm_status,
+        },
+    })
+
+
+_HEALTH_BODIES = {status: _health_body(status) for status in ("ok", "degraded", "unknown")}
+
 
 def register_llm_analyzer(svc: "LLMAnalyzerService") -> None:
     """Called from main.py to give the health endpoint access to the LLM service."""
@@ -30,13 +52,7 @@ def register_llm_analyzer(svc: "LLMAnalyzerService") -> None:
 
 app = FastAPI(title="Naga-7 API", version="1.0.0")
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(FastCORSMiddleware)
 
 # Include Routers
 app.include_router(auth.router, prefix="/api/v1")
@@ -51,18 +67,26 @@ app.include_router(agent_config.router, prefix="/api/v1/agent-config", tags=["Ag
 
 @app.get("/health")
 async def health():
-    llm_status = "unknown"
-    if _llm_analyzer_ref is not None:
-        llm_ok = await _llm_analyzer_ref.check_llm_health()
-        llm_status = "ok" if llm_ok else "degraded"
+    return Response(content=_HEALTH_BODIES[_llm_status], media_type="application/json")
 
-    overall = "ok" if llm_status in ("ok", "unknown") else "degraded"
-    return {
-        "status": overall,
-        "components": {
-            "llm_analyzer": llm_status,
-        },
-    }
+
+_LISTEN_BACKLOG = 4096
+
+
+def _bind_listener(host: str, port: int) -> socket.socket:
+    """
+    Bind a listening socket with SO_REUSEPORT so several N7-Core/API processes can
+    share one port and let the kernel balance accepted connections between them.
+    Falls back to a plain bind on platforms without SO_REUSEPORT (Windows).
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(_LISTEN_BACKLOG)
+    return sock
 
 
 class APIGatewayService(BaseService):
@@ -75,12 +99,29 @@ class APIGatewayService(BaseService):
         super().__init__("APIGatewayService")
         self._server = None
         self._internal_server = None
+        self._llm_poll_task: Optional[asyncio.Task] = None
+
+    async def _poll_llm_health(self):
+        """Background loop keeping the module-level `_llm_status` fresh for /health."""
+        global _llm_status
+        while True:
+            if _llm_analyzer_ref is not None:
+                try:
+                    llm_ok = await _llm_analyzer_ref.check_llm_health()
+                    _llm_status = "ok" if llm_ok else "degraded"
+                except Exception as e:
+                    logger.warning(f"LLM health poll failed: {e}")
+                    _llm_status = "degraded"
+            await asyncio.sleep(_LLM_HEALTH_POLL_INTERVAL)
 
     async def start(self):
-        logger.info(f"APIGatewayService ensuring startup on {settings.API_HOST}:{settings.API_PORT}")
-        config = Config(app=app, host=settings.API_HOST, port=settings.API_PORT, log_level="info")
+        settings = get_settings()
+        api_host, api_port = settings.API_HOST, settings.API_PORT
+        logger.info(f"APIGatewayService ensuring startup on {api_host}:{api_port}")
+        config = Config(app=app, host=api_host, port=api_port, log_level="info", backlog=_LISTEN_BACKLOG)
         self._server = Server(config)
-        asyncio.create_task(self._server.serve())
+        asyncio.create_task(self._server.serve(sockets=[_bind_listener(api_host, api_port)]))
+        self._llm_poll_task = asyncio.create_task(self._poll_llm_health())
 
         # Start Internal mTLS server on port 8443
         import os
@@ -95,20 +136,23 @@ class APIGatewayService(BaseService):
             logger.info("Starting internal mTLS API server on port 8443...")
             internal_config = Config(
                 app=app,
-                host=settings.API_HOST,
+                host=api_host,
                 port=8443,
                 log_level="info",
+                backlog=_LISTEN_BACKLOG,
                 ssl_keyfile=server_key_path,
                 ssl_certfile=server_cert_path,
                 ssl_ca_certs=ca_cert_path,
                 ssl_cert_reqs=ssl.CERT_REQUIRED
             )
             self._internal_server = Server(internal_config)
-            asyncio.create_task(self._internal_server.serve())
+            asyncio.create_task(self._internal_server.serve(sockets=[_bind_listener(api_host, 8443)]))
         else:
             logger.warning("mTLS certificates not found. Internal mTLS server (8443) will NOT start.")
 
     async def stop(self):
+        if self._llm_poll_task:
+            self._llm_poll_task.cancel()
         if self._server:
             self._server.should_exit = True
         if self._internal_server:
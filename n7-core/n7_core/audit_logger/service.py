@@ -1,8 +1,15 @@
+import asyncio
 import json
 import logging
-from datetime import datetime
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import List, Optional
 
+import orjson
+from asyncpg.exceptions import UniqueViolationError
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 
 from ..database.session import async_session_maker
 from ..messaging.nats_client import nats_client
@@ -11,6 +18,23 @@ from ..service_manager.base_service import BaseService
 
 logger = logging.getLogger("n7-core.audit-logger")
 
+# Column order for COPY-based bulk ingest (see AuditLoggerService.bulk_ingest)
+_COPY_COLUMNS = (
+    "log_id", "timestamp", "timestamp_ns", "actor", "action",
+    "resource", "details", "previous_hash", "current_hash",
+)
+
+# Chain head: hash and ordering key of the most recent entry
+_HEAD_STMT = select(AuditLog.current_hash, AuditLog.timestamp_ns).order_by(AuditLog.timestamp_ns.desc()).limit(1)
+
+# Appends retried when another writer extends the chain first (unique previous_hash)
+_CHAIN_APPEND_ATTEMPTS = 3
+
+
+def _canonical_details(details: Optional[dict]) -> str:
+    """Canonical (sorted-key, compact) JSON form of `details` used in the hash chain."""
+    return orjson.dumps(details or {}, option=orjson.OPT_SORT_KEYS).decode()
+
 
 class AuditLoggerService(BaseService):
     """
@@ -22,9 +46,18 @@ class AuditLoggerService(BaseService):
     def __init__(self):
         super().__init__("AuditLoggerService")
         self._running = False
+        # Head of the hash chain. The chain is append-only, so after seeding from the DB
+        # the previous hash is always the one we last wrote — no per-write SELECT needed.
+        self._last_hash: Optional[str] = None
+        self._last_hash_loaded = False
+        # timestamp_ns of the head: verify_hash_chain walks the chain in timestamp_ns
+        # order, so every appended entry must sort strictly after it.
+        self._last_ts_ns = 0
+        self._hash_lock = asyncio.Lock()
 
     async def start(self):
         self._running = True
+        await self._load_last_hash()
         logger.info("AuditLoggerService started.")
 
         # Subscribe to audit events
@@ -42,52 +75,181 @@ class AuditLoggerService(BaseService):
         self._running = False
         logger.info("AuditLoggerService stopped.")
 
+    async def _load_last_hash(self):
+        """
+        Seed the in-memory chain head from the most recent audit row.
+        Called once at startup; after a failed write the next entry re-reads
+        the head under a row lock instead.
+        """
+        try:
+            async with async_session_maker() as session:
+                result = await session.execute(_HEAD_STMT)
+            self._set_head(result.first())
+            self._last_hash_loaded = True
+        except Exception as e:
+            logger.warning(f"Could not seed audit hash chain head: {e}")
+            self._last_hash_loaded = False
+
+    async def _lock_head(self, session):
+        """Re-read the chain head under a row lock (cold cache, or lost an append race)."""
+        result = await session.execute(_HEAD_STMT.with_for_update())
+        self._set_head(result.first())
+        self._last_hash_loaded = True
+
+    def _set_head(self, row):
+        """Adopt a (current_hash, timestamp_ns) row, or an empty chain for None."""
+        self._last_hash, self._last_ts_ns = row if row is not None else (None, 0)
+
+    def _next_timestamp_ns(self, requested: Optional[int] = None) -> int:
+        """
+        timestamp_ns for the next chain entry: the requested value (or now), moved
+        forward to just after the head if it would not sort after it.
+        """
+        return max(requested or time.time_ns(), self._last_ts_ns + 1)
+
     async def log_entry(self, actor: str, action: str, resource: str = None, details: dict = None):
         """
         Create an audit log entry with hash chain.
         Can be called directly by other services or via NATS.
         """
-        try:
-            async with async_session_maker() as session:
-                # Get the most recent audit log entry to chain from
-                stmt = select(AuditLog).order_by(AuditLog.timestamp.desc()).limit(1)
-                result = await session.execute(stmt)
-                previous_entry = result.scalar_one_or_none()
-
-                previous_hash = previous_entry.current_hash if previous_entry else None
-
-                # Create new entry
-                timestamp = datetime.utcnow()
-                log_id = str(AuditLog.__table__.columns['log_id'].default.arg())  # Generate UUID
-
-                # Calculate hash
-                current_hash = AuditLog.calculate_hash(
-                    log_id=log_id,
-                    timestamp=timestamp.isoformat(),
-                    actor=actor,
-                    action=action,
-                    resource=resource or "",
-                    details=json.dumps(details or {}, sort_keys=True),
-                    previous_hash=previous_hash or ""
-                )
-
-                audit_entry = AuditLog(
-                    timestamp=timestamp,
-                    actor=actor,
-                    action=action,
-                    resource=resource,
-                    details=details or {},
-                    previous_hash=previous_hash,
-                    current_hash=current_hash
-                )
-
-                session.add(audit_entry)
-                await session.commit()
-
-                logger.debug(f"Audit log created: {action} by {actor}")
+        async with self._hash_lock:
+            await self._write_entry(actor, action, resource, details)
 
-        except Exception as e:
-            logger.error(f"Failed to create audit log: {e}", exc_info=True)
+    async def _write_entry(self, actor: str, action: str, resource: str = None, details: dict = None):
+        for attempt in range(1, _CHAIN_APPEND_ATTEMPTS + 1):
+            try:
+                async with async_session_maker() as session:
+                    if not self._last_hash_loaded:
+                        # Cold cache (startup seed failed or a previous write failed) —
+                        # lock the current head row so concurrent writers chain correctly.
+                        await self._lock_head(session)
+
+                    previous_hash = self._last_hash
+
+                    # Create new entry
+                    timestamp_ns = self._next_timestamp_ns()
+                    log_id = uuid.uuid4()
+
+                    # Calculate hash
+                    current_hash = AuditLog.calculate_hash(
+                        log_id=str(log_id),
+                        timestamp=str(timestamp_ns),
+                        actor=actor,
+                        action=action,
+                        resource=resource or "",
+                        details=_canonical_details(details),
+                        previous_hash=previous_hash or ""
+                    )
+
+                    audit_entry = AuditLog(
+                        log_id=log_id,
+                        # Derived from the hashed timestamp_ns, not a second clock read
+                        timestamp=datetime.fromtimestamp(timestamp_ns / 1e9, timezone.utc).replace(tzinfo=None),
+                        timestamp_ns=timestamp_ns,
+                        actor=actor,
+                        action=action,
+                        resource=resource,
+                        details=details or {},
+                        previous_hash=previous_hash,
+                        current_hash=current_hash
+                    )
+
+                    session.add(audit_entry)
+                    await session.commit()
+                    self._last_hash = current_hash
+                    self._last_ts_ns = timestamp_ns
+
+                    logger.debug(f"Audit log created: {action} by {actor}")
+                    return
+
+            except IntegrityError:
+                # previous_hash is unique, so another process already appended after
+                # the head we chained from — re-read it under lock and chain again.
+                self._last_hash_loaded = False
+                logger.warning(f"Audit chain head moved, retrying append ({attempt}/{_CHAIN_APPEND_ATTEMPTS})")
+            except Exception as e:
+                # Head may now be stale — re-read on next write.
+                self._last_hash_loaded = False
+                logger.error(f"Failed to create audit log: {e}", exc_info=True)
+                return
+
+        logger.error(f"Failed to create audit log: chain head still moving after {_CHAIN_APPEND_ATTEMPTS} attempts")
+
+    async def bulk_ingest(self, entries: List[dict]) -> int:
+        """
+        Append many audit entries in one binary COPY instead of per-row INSERTs.
+        Intended for backfill flows (e.g. replaying a NATS backlog on cold start).
+        Each entry takes the same keys as an n7.audit message, plus an optional
+        "timestamp_ns"; entries are chained in the order given, after the current head.
+        The chain is verified in timestamp_ns order, so a timestamp that would sort
+        before the head or the previous entry (e.g. historical backfill) is moved
+        forward to 1ns after it.
+        Returns the number of rows written.
+        """
+        if not entries:
+            return 0
+
+        async with self._hash_lock:
+            for attempt in range(1, _CHAIN_APPEND_ATTEMPTS + 1):
+                try:
+                    async with async_session_maker() as session:
+                        if not self._last_hash_loaded:
+                            await self._lock_head(session)
+
+                        previous_hash = self._last_hash
+                        timestamp_ns = self._last_ts_ns
+                        records = []
+                        for entry in entries:
+                            log_id = uuid.uuid4()
+                            timestamp_ns = max(entry.get("timestamp_ns") or time.time_ns(), timestamp_ns + 1)
+                            actor = entry.get("actor", "system")
+                            action = entry.get("action", "unknown")
+                            resource = entry.get("resource")
+                            details = _canonical_details(entry.get("details"))
+                            current_hash = AuditLog.calculate_hash(
+                                log_id=str(log_id),
+                                timestamp=str(timestamp_ns),
+                                actor=actor,
+                                action=action,
+                                resource=resource or "",
+                                details=details,
+                                previous_hash=previous_hash or ""
+                            )
+                            timestamp = datetime.fromtimestamp(timestamp_ns / 1e9, timezone.utc).replace(tzinfo=None)
+                            records.append((
+                                log_id, timestamp, timestamp_ns, actor, action,
+                                resource, details, previous_hash, current_hash,
+                            ))
+                            previous_hash = current_hash
+
+                        conn = await session.connection()
+                        raw_conn = await conn.get_raw_connection()
+                        await raw_conn.driver_connection.copy_records_to_table(
+                            AuditLog.__tablename__, records=records, columns=_COPY_COLUMNS
+                        )
+                        await session.commit()
+                        self._last_hash = previous_hash
+                        self._last_ts_ns = timestamp_ns
+
+                    logger.info(f"Bulk-ingested {len(records)} audit log entries")
+                    return len(records)
+
+                except (IntegrityError, UniqueViolationError):
+                    # COPY goes through asyncpg directly, so the conflict arrives unwrapped
+                    self._last_hash_loaded = False
+                    logger.warning(
+                        f"Audit chain head moved, retrying bulk ingest ({attempt}/{_CHAIN_APPEND_ATTEMPTS})"
+                    )
+                except Exception as e:
+                    self._last_hash_loaded = False
+                    logger.error(f"Failed to bulk-ingest audit log entries: {e}", exc_info=True)
+                    return 0
+
+            logger.error(
+                f"Failed to bulk-ingest audit log entries: chain head still moving after "
+                f"{_CHAIN_APPEND_ATTEMPTS} attempts"
+            )
+            return 0
 
     async def handle_audit_event(self, msg):
         """
@@ -101,7 +263,7 @@ class AuditLoggerService(BaseService):
         }
         """
         try:
-            data = json.loads(msg.data.decode())
+            data = orjson.loads(msg.data)
             await self.log_entry(
                 actor=data.get("actor", "system"),
                 action=data.get("action", "unknown"),
@@ -118,22 +280,32 @@ class AuditLoggerService(BaseService):
         """
         try:
             async with async_session_maker() as session:
-                stmt = select(AuditLog).order_by(AuditLog.timestamp.asc())
+                stmt = select(AuditLog).order_by(AuditLog.timestamp_ns.asc())
                 result = await session.execute(stmt)
                 entries = result.scalars().all()
 
                 previous_hash = None
                 for entry in entries:
-                    # Recalculate hash
-                    expected_hash = AuditLog.calculate_hash(
+                    # Recalculate hash. Legacy entries were hashed over the ISO timestamp
+                    # and stdlib json.dumps output, so accept those forms too.
+                    hash_fields = dict(
                         log_id=str(entry.log_id),
-                        timestamp=entry.timestamp.isoformat(),
                         actor=entry.actor,
                         action=entry.action,
                         resource=entry.resource or "",
-                        details=json.dumps(entry.details, sort_keys=True),
                         previous_hash=entry.previous_hash or ""
                     )
+                    expected_hash = AuditLog.calculate_hash(
+                        timestamp=str(entry.timestamp_ns),
+                        details=_canonical_details(entry.details),
+                        **hash_fields
+                    )
+                    if expected_hash != entry.current_hash:
+                        expected_hash = AuditLog.calculate_hash(
+                            timestamp=entry.timestamp.isoformat(),
+                            details=json.dumps(entry.details, sort_keys=True),
+                            **hash_fields
+                        )
 
                     # Verify hash matches
                     if expected_hash != entry.current_hash:
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Literal
 
 from pydantic import PostgresDsn, RedisDsn
@@ -9,7 +10,8 @@ class Settings(BaseSettings):
     Application Configuration.
     Reads from environment variables and .env file.
     """
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore")
+    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False, extra="ignore",
+                                      frozen=True)
 
     # Functionality
     ENVIRONMENT: Literal["development", "production", "testing"] = "development"
@@ -42,4 +44,20 @@ class Settings(BaseSettings):
     TI_IOC_TTL: int = 86400        # Redis TTL for feed-sourced IOCs (24 hours)
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Return the process-wide Settings instance, parsing the environment on first use.
+    Use as a FastAPI dependency (`Depends(get_settings)`); tests can override it via
+    `app.dependency_overrides` or call `get_settings.cache_clear()`.
+    """
+    return Settings()
+
+
+def __getattr__(name: str):
+    # `from n7_core.config import settings` (entry-point scripts such as
+    # migrations/env.py) still works, but builds Settings at that import;
+    # library modules call get_settings() where the value is used instead.
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
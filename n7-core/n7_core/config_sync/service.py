@@ -1,27 +1,130 @@
+import asyncio
 import base64
 import hashlib
 import logging
-from datetime import datetime
+import os
+from contextlib import nullcontext
+from functools import lru_cache
 from typing import Optional
 from uuid import UUID
 
+import msgspec
+import orjson
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from sqlalchemy import select
-
-from ..config import settings
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+try:
+    # Rust-backed Fernet: same token format, far less Python overhead on short payloads
+    from rfernet import Fernet as _RFernet
+except ImportError:
+    _RFernet = None
+
+from ..config import get_settings
+from ..database.base import utc_now
+from ..database.redis import get_redis_bytes_client
 from ..database.session import async_session_maker
 from ..models.agent_config import AgentConfig
 from ..service_manager.base_service import BaseService
 
 logger = logging.getLogger("n7-core.config-sync")
 
-
+# Cipher used for the transport-encrypted fields; advertised to agents in the
+# config response so they know how to decrypt (older Cores sent Fernet tokens).
+TRANSPORT_CIPHER = "aes-256-gcm"
+_GCM_NONCE_BYTES = 12
+
+# Plaintext fields upsert_config() copies straight from the caller's dict
+_UPDATABLE_FIELDS = (
+    "log_level", "environment", "zone",
+    # Sentinel-specific
+    "probe_interval_seconds", "detection_thresholds", "enabled_probes",
+    # Striker-specific
+    "capabilities", "allowed_actions", "action_defaults", "max_concurrent_actions",
+)
+
+# agent_configs columns kept in the Redis read-through cache (see _load_config_row)
+_CACHED_FIELDS = ("nats_url_enc", "core_api_url_enc", "config_version") + _UPDATABLE_FIELDS
+_CACHED_COLUMNS = tuple(getattr(AgentConfig, field) for field in _CACHED_FIELDS)
+_CONFIG_CACHE_TTL = 60  # seconds
+_PLAIN_CACHE_SIZE = 10_000
+# Batch size above which get_configs_for_agents() moves crypto off the event loop
+_BULK_THREAD_THRESHOLD = 64
+
+
+class AgentConfigResponse(msgspec.Struct):
+    """Wire shape of GET /agent-config/{agent_id}/config, encoded with msgspec."""
+    agent_id: str
+    nats_url_enc: Optional[str]
+    core_api_url_enc: Optional[str]
+    transport_cipher: str
+    log_level: Optional[str]
+    environment: Optional[str]
+    zone: Optional[str]
+    config_version: int
+    # Sentinel-specific
+    probe_interval_seconds: Optional[int]
+    detection_thresholds: dict
+    enabled_probes: list
+    # Striker-specific
+    capabilities: list
+    allowed_actions: Optional[list]
+    action_defaults: dict
+    max_concurrent_actions: Optional[int]
+
+
+@lru_cache(maxsize=4096)
 def _derive_fernet_key(secret: str) -> bytes:
-    """Derive a 32-byte URL-safe base64 Fernet key from an arbitrary secret string."""
+    """
+    Derive a 32-byte URL-safe base64 Fernet key from an arbitrary secret string.
+    Must stay SHA-256: every stored agent_configs token (and agents' legacy Fernet
+    decode path) depends on this exact derivation. Cached, so it runs once per secret.
+    """
     digest = hashlib.sha256(secret.encode()).digest()
     return base64.urlsafe_b64encode(digest)
 
 
+class _TextFernet:
+    """Fernet with str plaintexts and str tokens (cryptography backend)."""
+
+    __slots__ = ("_f",)
+
+    def __init__(self, key: bytes):
+        self._f = Fernet(key)
+
+    def encrypt(self, plain: str) -> str:
+        return self._f.encrypt(plain.encode()).decode()
+
+    def decrypt(self, token: str) -> str:
+        return self._f.decrypt(token.encode()).decode()
+
+    def decrypt_bytes(self, token: str) -> bytes:
+        return self._f.decrypt(token.encode())
+
+
+class _RustTextFernet:
+    """Fernet with str plaintexts and str tokens (rfernet backend — tokens are already str)."""
+
+    __slots__ = ("_f",)
+
+    def __init__(self, key: bytes):
+        self._f = _RFernet(key.decode())
+
+    def encrypt(self, plain: str) -> str:
+        return self._f.encrypt(plain.encode())
+
+    def decrypt(self, token: str) -> str:
+        return self._f.decrypt(token).decode()
+
+    def decrypt_bytes(self, token: str) -> bytes:
+        return self._f.decrypt(token)
+
+
+_fernet_impl = _RustTextFernet if _RFernet is not None else _TextFernet
+
+
 class ConfigSyncService(BaseService):
     """
     Config Sync Service.
@@ -29,7 +132,7 @@ class ConfigSyncService(BaseService):
 
     Sensitive fields (nats_url, core_api_url) are Fernet-encrypted at rest using the
     Core's SECRET_KEY. When serving config to an agent via the API, those fields are
-    additionally re-encrypted with a key derived from that agent's own API key —
+    re-encrypted (AES-256-GCM) with a key derived from that agent's own API key —
     so only the requesting agent can decrypt them.
 
     Ref: TDD Section 5.x Agent Configuration Management
@@ -37,7 +140,16 @@ class ConfigSyncService(BaseService):
 
     def __init__(self):
         super().__init__("ConfigSyncService")
-        self._fernet = Fernet(_derive_fernet_key(settings.SECRET_KEY))
+        settings = get_settings()
+        self._fernet = _fernet_impl(_derive_fernet_key(settings.SECRET_KEY))
+        # Storage token -> plaintext bytes. Keyed by the token itself, so a write
+        # (new token) simply misses; auto-provisioned agents share the default
+        # tokens and hit. Plaintext stays in-process only, never in Redis.
+        self._decrypt_cached = lru_cache(maxsize=_PLAIN_CACHE_SIZE)(self._fernet.decrypt_bytes)
+        # Storage tokens for the fixed Core endpoints used when auto-provisioning;
+        # encrypted once per process instead of on every upsert.
+        self._default_nats_enc = self._encrypt_for_storage(settings.NATS_URL)
+        self._default_core_enc = self._encrypt_for_storage(f"http://{settings.API_HOST}:{settings.API_PORT}")
 
     async def start(self):
         logger.info("ConfigSyncService started.")
@@ -50,23 +162,37 @@ class ConfigSyncService(BaseService):
     # ------------------------------------------------------------------
 
     def _encrypt_for_storage(self, plain: str) -> str:
-        return self._fernet.encrypt(plain.encode()).decode()
+        return self._fernet.encrypt(plain)
 
     def _decrypt_from_storage(self, enc: str) -> str:
-        return self._fernet.decrypt(enc.encode()).decode()
+        return self._fernet.decrypt(enc)
+
+    def _decrypt_from_storage_bytes(self, enc: str) -> bytes:
+        # For plaintext that is only re-encrypted for transport: skips the
+        # str decode/encode round-trip, and the decrypt itself on repeat polls.
+        return self._decrypt_cached(enc)
 
     # ------------------------------------------------------------------
     # Transport-level encryption (agent API key)
-    # Used so only the target agent can decrypt nats_url / core_api_url
+    # Used so only the target agent can decrypt nats_url / core_api_url.
+    # AES-256-GCM keyed by sha256(api_key): a single AEAD seal instead of
+    # Fernet's CBC + HMAC + framing. Token = base64url(nonce || ciphertext).
     # ------------------------------------------------------------------
 
     @staticmethod
-    def _agent_fernet(api_key: str) -> Fernet:
-        """Derive a Fernet instance keyed to a specific agent's API key."""
-        return Fernet(_derive_fernet_key(api_key))
+    @lru_cache(maxsize=4096)
+    def _agent_aead(api_key: str) -> AESGCM:
+        """
+        AES-GCM cipher keyed to a specific agent's API key.
+        Cached so steady-state polls skip key derivation and cipher setup;
+        bounded so API-key rotation can't grow it without limit.
+        """
+        return AESGCM(hashlib.sha256(api_key.encode()).digest())
 
-    def _encrypt_for_transport(self, plain: str, api_key: str) -> str:
-        return self._agent_fernet(api_key).encrypt(plain.encode()).decode()
+    def _encrypt_for_transport(self, plain: bytes, api_key: str) -> str:
+        nonce = os.urandom(_GCM_NONCE_BYTES)
+        sealed = self._agent_aead(api_key).encrypt(nonce, plain, None)
+        return base64.urlsafe_b64encode(nonce + sealed).decode()
 
     # ------------------------------------------------------------------
     # Public API
@@ -112,68 +238,46 @@ class ConfigSyncService(BaseService):
             capabilities = capabilities or ["network_block", "process_kill", "file_quarantine"]
             action_defaults = action_defaults or {"network_block": {"duration": 3600}}
 
-        async with async_session_maker() as session:
-            result = await session.execute(
-                select(AgentConfig).where(AgentConfig.agent_id == agent_id)
-            )
-            cfg = result.scalar_one_or_none()
-
-            encrypted_nats = self._encrypt_for_storage(nats_url)
-            encrypted_core = self._encrypt_for_storage(core_api_url)
-
-            if cfg:
-                cfg.nats_url_enc = encrypted_nats
-                cfg.core_api_url_enc = encrypted_core
-                cfg.zone = zone
-                cfg.log_level = log_level
-                cfg.environment = environment
-                # Sentinel fields
-                cfg.probe_interval_seconds = probe_interval_seconds
-                if detection_thresholds is not None:
-                    cfg.detection_thresholds = detection_thresholds
-                if enabled_probes is not None:
-                    cfg.enabled_probes = enabled_probes
-                # Striker fields
-                if capabilities is not None:
-                    cfg.capabilities = capabilities
-                if allowed_actions is not None:
-                    cfg.allowed_actions = allowed_actions
-                if action_defaults is not None:
-                    cfg.action_defaults = action_defaults
-                if max_concurrent_actions is not None:
-                    cfg.max_concurrent_actions = max_concurrent_actions
-                cfg.config_version += 1
-                cfg.updated_at = datetime.utcnow()
-            else:
-                cfg = AgentConfig(
-                    agent_id=agent_id,
-                    nats_url_enc=encrypted_nats,
-                    core_api_url_enc=encrypted_core,
-                    zone=zone,
-                    log_level=log_level,
-                    environment=environment,
-                    # Sentinel fields
-                    probe_interval_seconds=probe_interval_seconds,
-                    detection_thresholds=detection_thresholds,
-                    enabled_probes=enabled_probes,
-                    # Striker fields
-                    capabilities=capabilities,
-                    allowed_actions=allowed_actions,
-                    action_defaults=action_defaults,
-                    max_concurrent_actions=max_concurrent_actions,
-                    config_version=1,
-                    updated_at=datetime.utcnow(),
-                )
-                session.add(cfg)
+        encrypted_nats = self._encrypt_for_storage(nats_url)
+        encrypted_core = self._encrypt_for_storage(core_api_url)
+
+        # Always-replaced fields; type-specific ones only when they have a value,
+        # so re-provisioning doesn't wipe operator-set thresholds/capabilities.
+        update_values = {
+            "nats_url_enc": encrypted_nats,
+            "core_api_url_enc": encrypted_core,
+            "zone": zone,
+            "log_level": log_level,
+            "environment": environment,
+            "probe_interval_seconds": probe_interval_seconds,
+        }
+        optional_values = {
+            "detection_thresholds": detection_thresholds,
+            "enabled_probes": enabled_probes,
+            "capabilities": capabilities,
+            "allowed_actions": allowed_actions,
+            "action_defaults": action_defaults,
+            "max_concurrent_actions": max_concurrent_actions,
+        }
+        update_values.update({k: v for k, v in optional_values.items() if v is not None})
 
-            await session.commit()
-            await session.refresh(cfg)
-            logger.info(f"Provisioned config for agent {agent_id} (version {cfg.config_version})")
-            return cfg
+        cfg = await self._upsert(
+            agent_id,
+            insert_values={**optional_values, **update_values},
+            update_values=update_values,
+        )
+        logger.info(f"Provisioned config for agent {agent_id} (version {cfg.config_version})")
+        return cfg
 
-    async def get_config_for_agent(self, agent_id: UUID, api_key: str) -> Optional[dict]:
+    async def get_config_for_agent(
+        self,
+        agent_id: UUID,
+        api_key: str,
+        session: Optional[AsyncSession] = None,
+    ) -> Optional[AgentConfigResponse]:
         """
-        Fetch the config for an agent and return it as a dict ready for the API response.
+        Fetch the config for an agent and return it as an AgentConfigResponse,
+        ready to be encoded straight to JSON with msgspec.
 
         Sensitive fields (nats_url, core_api_url) are:
         1. Decrypted from storage (Core key)
@@ -182,19 +286,59 @@ class ConfigSyncService(BaseService):
         The agent derives the same transport key from its own API key to decrypt locally.
         All other fields are returned in plaintext.
 
+        Pass the request-scoped `session` from the API route so the lookup reuses
+        the connection already checked out for authentication; without one, a
+        short-lived session is opened.
+
         Returns None if no config exists for this agent.
         """
-        async with async_session_maker() as session:
-            result = await session.execute(
-                select(AgentConfig).where(AgentConfig.agent_id == agent_id)
-            )
-            cfg = result.scalar_one_or_none()
-            if not cfg:
-                return None
+        row = await self._load_config_row(agent_id, session)
+        if row is None:
+            return None
+        return self._build_response(agent_id, row, api_key)
 
+    async def get_configs_for_agents(
+        self,
+        pairs: list[tuple[UUID, str]],
+        session: Optional[AsyncSession] = None,
+    ) -> dict[UUID, AgentConfigResponse]:
+        """
+        Bulk form of get_config_for_agent for (agent_id, api_key) pairs.
+        Reads every row in one `agent_id IN (...)` SELECT and reuses the cached
+        per-agent AEAD ciphers; large batches run the crypto loop in a worker
+        thread (OpenSSL releases the GIL) so the event loop keeps serving.
+
+        Agents with no config, or whose stored tokens fail to decrypt, are omitted.
+        """
+        if not pairs:
+            return {}
+
+        ids = [agent_id for agent_id, _ in pairs]
+        stmt = select(AgentConfig.agent_id, *_CACHED_COLUMNS).where(AgentConfig.agent_id.in_(ids))
+        async with nullcontext(session) if session is not None else async_session_maker() as db:
+            result = await db.execute(stmt)
+            rows = {found.agent_id: found._mapping for found in result}
+
+        def build() -> dict[UUID, AgentConfigResponse]:
+            responses = {}
+            for agent_id, api_key in pairs:
+                row = rows.get(agent_id)
+                if row is None:
+                    continue
+                response = self._build_response(agent_id, row, api_key)
+                if response is not None:
+                    responses[agent_id] = response
+            return responses
+
+        if len(pairs) >= _BULK_THREAD_THRESHOLD:
+            return await asyncio.to_thread(build)
+        return build()
+
+    def _build_response(self, agent_id: UUID, row, api_key: str) -> Optional[AgentConfigResponse]:
+        """Storage-decrypt, transport-encrypt and shape one config row; None if decrypt fails."""
         try:
-            plain_nats = self._decrypt_from_storage(cfg.nats_url_enc) if cfg.nats_url_enc else None
-            plain_core = self._decrypt_from_storage(cfg.core_api_url_enc) if cfg.core_api_url_enc else None
+            plain_nats = self._decrypt_from_storage_bytes(row["nats_url_enc"]) if row["nats_url_enc"] else None
+            plain_core = self._decrypt_from_storage_bytes(row["core_api_url_enc"]) if row["core_api_url_enc"] else None
         except Exception as e:
             logger.error(f"Failed to decrypt config for agent {agent_id}: {e}")
             return None
@@ -203,24 +347,58 @@ class ConfigSyncService(BaseService):
         transport_nats = self._encrypt_for_transport(plain_nats, api_key) if plain_nats else None
         transport_core = self._encrypt_for_transport(plain_core, api_key) if plain_core else None
 
-        return {
-            "agent_id": str(agent_id),
-            "nats_url_enc": transport_nats,
-            "core_api_url_enc": transport_core,
-            "log_level": cfg.log_level,
-            "environment": cfg.environment,
-            "zone": cfg.zone,
-            "config_version": cfg.config_version,
+        return AgentConfigResponse(
+            agent_id=str(agent_id),
+            nats_url_enc=transport_nats,
+            core_api_url_enc=transport_core,
+            transport_cipher=TRANSPORT_CIPHER,
+            log_level=row["log_level"],
+            environment=row["environment"],
+            zone=row["zone"],
+            config_version=row["config_version"],
             # Sentinel-specific
-            "probe_interval_seconds": cfg.probe_interval_seconds,
-            "detection_thresholds": cfg.detection_thresholds or {},
-            "enabled_probes": cfg.enabled_probes or [],
+            probe_interval_seconds=row["probe_interval_seconds"],
+            detection_thresholds=row["detection_thresholds"] or {},
+            enabled_probes=row["enabled_probes"] or [],
             # Striker-specific
-            "capabilities": cfg.capabilities or [],
-            "allowed_actions": cfg.allowed_actions,
-            "action_defaults": cfg.action_defaults or {},
-            "max_concurrent_actions": cfg.max_concurrent_actions,
-        }
+            capabilities=row["capabilities"] or [],
+            allowed_actions=row["allowed_actions"],
+            action_defaults=row["action_defaults"] or {},
+            max_concurrent_actions=row["max_concurrent_actions"],
+        )
+
+    async def _load_config_row(
+        self, agent_id: UUID, session: Optional[AsyncSession] = None
+    ) -> Optional[dict]:
+        """
+        Read-through cache over the agent_configs row.
+        Only storage-encrypted values are cached, never plaintext URLs. The entry is
+        dropped on every write, and the short TTL bounds staleness if a delete is missed.
+        """
+        cache_key = f"n7:agent_config:{agent_id}"
+        try:
+            cached_raw = await get_redis_bytes_client().get(cache_key)
+            if cached_raw:
+                return orjson.loads(cached_raw)
+        except Exception as e:
+            logger.warning(f"Config cache read failed for agent {agent_id}: {e}")
+
+        # Column-limited Core select: only the fields we serve, returned as a plain
+        # Row so the ORM identity map and full-row hydration are skipped entirely.
+        async with nullcontext(session) if session is not None else async_session_maker() as db:
+            result = await db.execute(
+                select(*_CACHED_COLUMNS).where(AgentConfig.agent_id == agent_id)
+            )
+            found = result.first()
+            if found is None:
+                return None
+
+        row = dict(found._mapping)
+        try:
+            await get_redis_bytes_client().set(cache_key, orjson.dumps(row), ex=_CONFIG_CACHE_TTL)
+        except Exception as e:
+            logger.warning(f"Config cache write failed for agent {agent_id}: {e}")
+        return row
 
     async def upsert_config(self, agent_id: UUID, config_dict: dict, agent_type: str = "") -> AgentConfig:
         """
@@ -229,89 +407,88 @@ class ConfigSyncService(BaseService):
         Increments config_version on each call. Creates a default config row if none exists.
         agent_type is used only when auto-provisioning a new row (sets type-appropriate defaults).
         """
+        # Plaintext-updatable fields; sensitive ones are encrypted before storage
+        update_values = {
+            field: config_dict[field]
+            for field in _UPDATABLE_FIELDS
+            if field in config_dict
+        }
+        if "nats_url" in config_dict:
+            update_values["nats_url_enc"] = self._encrypt_for_storage(config_dict["nats_url"])
+        if "core_api_url" in config_dict:
+            update_values["core_api_url_enc"] = self._encrypt_for_storage(config_dict["core_api_url"])
+
+        # Row used only if none exists yet: a default config so operators can configure
+        # agents that registered themselves (not deployed via DeploymentService).
+        sentinel_thresholds = None
+        sentinel_probes = None
+        striker_caps = None
+        striker_defaults = None
+        if agent_type == "sentinel":
+            sentinel_thresholds = {
+                "cpu_threshold": 80,
+                "mem_threshold": 85,
+                "disk_threshold": 90,
+                "load_multiplier": 2.0,
+            }
+            sentinel_probes = ["system", "network", "process", "file"]
+        elif agent_type == "striker":
+            striker_caps = ["network_block", "process_kill", "file_quarantine"]
+            striker_defaults = {"network_block": {"duration": 3600}}
+
+        insert_values = {
+            "nats_url_enc": self._default_nats_enc,
+            "core_api_url_enc": self._default_core_enc,
+            "zone": "default",
+            "log_level": "INFO",
+            "environment": get_settings().ENVIRONMENT,
+            # Sentinel fields
+            "probe_interval_seconds": 10,
+            "detection_thresholds": sentinel_thresholds,
+            "enabled_probes": sentinel_probes,
+            # Striker fields
+            "capabilities": striker_caps,
+            "allowed_actions": None,
+            "action_defaults": striker_defaults,
+            "max_concurrent_actions": None,
+            **update_values,
+        }
+
+        cfg = await self._upsert(agent_id, insert_values=insert_values, update_values=update_values)
+        if cfg.config_version == 1:
+            logger.info(f"Auto-provisioned default config for agent {agent_id} (type={agent_type or 'unknown'})")
+        logger.info(f"Updated config for agent {agent_id} (version {cfg.config_version})")
+        return cfg
+
+    async def _upsert(self, agent_id: UUID, insert_values: dict, update_values: dict) -> AgentConfig:
+        """
+        Single-round-trip INSERT ... ON CONFLICT (agent_id) DO UPDATE ... RETURNING.
+        New rows start at config_version 1; existing rows get `update_values`
+        applied and their version bumped.
+        """
+        stmt = pg_insert(AgentConfig).values(
+            agent_id=agent_id,
+            config_version=1,
+            **insert_values,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[AgentConfig.agent_id],
+            set_={
+                **update_values,
+                "config_version": AgentConfig.config_version + 1,
+                "updated_at": utc_now(),
+            },
+        ).returning(AgentConfig)
+
         async with async_session_maker() as session:
-            result = await session.execute(
-                select(AgentConfig).where(AgentConfig.agent_id == agent_id)
-            )
-            cfg = result.scalar_one_or_none()
-            if not cfg:
-                # Auto-provision a default config row so operators can configure
-                # agents that registered themselves (not deployed via DeploymentService).
-                from ..config import settings as _settings
-                encrypted_nats = self._encrypt_for_storage(_settings.NATS_URL)
-                encrypted_core = self._encrypt_for_storage(
-                    f"http://{_settings.API_HOST}:{_settings.API_PORT}"
+            async with session.begin():
+                result = await session.execute(
+                    stmt, execution_options={"populate_existing": True}
                 )
-                # Set type-appropriate defaults
-                sentinel_thresholds = None
-                sentinel_probes = None
-                striker_caps = None
-                striker_defaults = None
-                if agent_type == "sentinel":
-                    sentinel_thresholds = {
-                        "cpu_threshold": 80,
-                        "mem_threshold": 85,
-                        "disk_threshold": 90,
-                        "load_multiplier": 2.0,
-                    }
-                    sentinel_probes = ["system", "network", "process", "file"]
-                elif agent_type == "striker":
-                    striker_caps = ["network_block", "process_kill", "file_quarantine"]
-                    striker_defaults = {"network_block": {"duration": 3600}}
-
-                cfg = AgentConfig(
-                    agent_id=agent_id,
-                    nats_url_enc=encrypted_nats,
-                    core_api_url_enc=encrypted_core,
-                    zone="default",
-                    log_level="INFO",
-                    environment=_settings.ENVIRONMENT,
-                    # Sentinel fields
-                    probe_interval_seconds=10,
-                    detection_thresholds=sentinel_thresholds,
-                    enabled_probes=sentinel_probes,
-                    # Striker fields
-                    capabilities=striker_caps,
-                    allowed_actions=None,
-                    action_defaults=striker_defaults,
-                    max_concurrent_actions=None,
-                    config_version=0,
-                    updated_at=datetime.utcnow(),
-                )
-                session.add(cfg)
-                logger.info(f"Auto-provisioned default config for agent {agent_id} (type={agent_type or 'unknown'})")
-
-            # Shared fields
-            if "nats_url" in config_dict:
-                cfg.nats_url_enc = self._encrypt_for_storage(config_dict["nats_url"])
-            if "core_api_url" in config_dict:
-                cfg.core_api_url_enc = self._encrypt_for_storage(config_dict["core_api_url"])
-            if "log_level" in config_dict:
-                cfg.log_level = config_dict["log_level"]
-            if "environment" in config_dict:
-                cfg.environment = config_dict["environment"]
-            if "zone" in config_dict:
-                cfg.zone = config_dict["zone"]
-            # Sentinel-specific fields
-            if "probe_interval_seconds" in config_dict:
-                cfg.probe_interval_seconds = config_dict["probe_interval_seconds"]
-            if "detection_thresholds" in config_dict:
-                cfg.detection_thresholds = config_dict["detection_thresholds"]
-            if "enabled_probes" in config_dict:
-                cfg.enabled_probes = config_dict["enabled_probes"]
-            # Striker-specific fields
-            if "capabilities" in config_dict:
-                cfg.capabilities = config_dict["capabilities"]
-            if "allowed_actions" in config_dict:
-                cfg.allowed_actions = config_dict["allowed_actions"]
-            if "action_defaults" in config_dict:
-                cfg.action_defaults = config_dict["action_defaults"]
-            if "max_concurrent_actions" in config_dict:
-                cfg.max_concurrent_actions = config_dict["max_concurrent_actions"]
-
-            cfg.config_version += 1
-            cfg.updated_at = datetime.utcnow()
-            await session.commit()
-            await session.refresh(cfg)
-            logger.info(f"Updated config for agent {agent_id} (version {cfg.config_version})")
-            return cfg
+                cfg = result.scalar_one()
+
+        try:
+            await get_redis_bytes_client().delete(f"n7:agent_config:{agent_id}")
+        except Exception as e:
+            logger.warning(f"Config cache invalidation failed for agent {agent_id}: {e}")
+        return cfg
@@ -1,7 +1,7 @@
 from datetime import datetime
 from uuid import UUID, uuid4
 
-from sqlalchemy import DateTime
+from sqlalchemy import DateTime, func
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -14,9 +14,18 @@ class Base(AsyncAttrs, DeclarativeBase):
     pass
 
 
+def utc_now():
+    """Server-side UTC timestamp (naive, matching the existing DateTime columns)."""
+    return func.timezone("utc", func.now())
+
+
 class TimestampMixin:
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow,
+    # Timestamps are filled by PostgreSQL rather than computed per write in Python;
+    # eager_defaults fetches them back via RETURNING so no lazy load is needed later.
+    __mapper_args__ = {"eager_defaults": True}
+
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=utc_now(), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=utc_now(), onupdate=utc_now(),
                                                  nullable=False)
 
 
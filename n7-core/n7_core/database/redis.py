@@ -1,9 +1,36 @@
+from functools import lru_cache
+
 from redis.asyncio import Redis, from_url
 
-from ..config import settings
+from ..config import get_settings
+
+# Sized for the hot-path caches (dedup, IOC, agent config) under concurrent load;
+# redis-py switches to the hiredis C parser automatically when it is installed.
+_POOL_OPTIONS = dict(
+    max_connections=100,
+    health_check_interval=30,
+    socket_keepalive=True,
+)
+
 
-redis_client: Redis = from_url(str(settings.REDIS_URL), decode_responses=True)
+@lru_cache(maxsize=1)
+def get_redis_client() -> Redis:
+    """
+    Process-wide Redis client (str replies), created on first use so importing a
+    service module doesn't parse the URL or build a pool before the loop is running.
+    """
+    return from_url(str(get_settings().REDIS_URL), decode_responses=True, **_POOL_OPTIONS)
+
+
+@lru_cache(maxsize=1)
+def get_redis_bytes_client() -> Redis:
+    """
+    Same server, no response decoding: for values stored as raw bytes (orjson-encoded
+    cache entries), which would otherwise be decoded to str only to be re-parsed.
+    """
+    return from_url(str(get_settings().REDIS_URL), **_POOL_OPTIONS)
 
 
 async def get_redis() -> Redis:
-    return redis_client
+    return get_redis_client()
+
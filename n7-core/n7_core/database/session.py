@@ -1,27 +1,76 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-
-from ..config import settings
-
-# Async Engine
-engine = create_async_engine(
-    str(settings.DATABASE_URL),
-    echo=settings.DEBUG,
-    future=True,
-    pool_pre_ping=True,  # Check connection liveness before checkout
-    pool_size=100,  # Production tuning: supports 1000-node deployments
-    max_overflow=50
-)
+import asyncio
+import logging
+from functools import lru_cache
+from typing import AsyncIterator
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from ..config import get_settings
+
+logger = logging.getLogger("n7-core.database")
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """Process-wide async engine, created on first use so importing a service doesn't read settings."""
+    settings = get_settings()
+    return create_async_engine(
+        str(settings.DATABASE_URL),
+        echo=settings.DEBUG,
+        future=True,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_pre_ping=True,  # Check connection liveness before checkout
+        pool_size=100,  # Production tuning: supports 1000-node deployments
+        max_overflow=50,
+        pool_recycle=1800,  # Recycle before server/proxy idle timeouts drop the socket
+        query_cache_size=1200,  # Compiled-SQL cache; default 500 churns with ~all models loaded
+        connect_args={
+            # Per-connection server-side prepared statements (SQLAlchemy adapter + asyncpg);
+            # both default to 100, too few once every service's hot queries are counted.
+            "prepared_statement_cache_size": 1000,
+            "statement_cache_size": 1000,
+        },
+    )
+
+
+class _EngineSessionMaker(async_sessionmaker):
+    """async_sessionmaker that binds to get_engine() on the first session, not at import."""
+
+    def __call__(self, **local_kw) -> AsyncSession:
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
 
 # Session Factory
-async_session_maker = async_sessionmaker(
-    bind=engine,
+async_session_maker = _EngineSessionMaker(
     class_=AsyncSession,
     expire_on_commit=False,
     autoflush=False
 )
 
 
-async def get_session() -> AsyncSession:
+async def prewarm_pool(connections: int = 20):
+    """
+    Open `connections` pooled connections up front so the first requests after
+    startup don't pay TCP + auth setup. SQLAlchemy otherwise connects lazily.
+    Connections are held concurrently so each gather() leg creates its own.
+    """
+    async def _ping():
+        async with get_engine().connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    results = await asyncio.gather(*(_ping() for _ in range(connections)), return_exceptions=True)
+    failures = [r for r in results if isinstance(r, Exception)]
+    if failures:
+        logger.warning(f"DB pool pre-warm: {len(failures)}/{connections} connections failed ({failures[0]})")
+    else:
+        logger.info(f"DB pool pre-warmed with {connections} connections")
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
     """
     Dependency for getting an async database session.
     Yields the session and ensures it's closed after use.
@@ -0,0 +1,90 @@
+"""
+Escalation policy: maps a parsed alert to (verdict, action_to_take).
+
+Pure, synchronous and fully annotated (no I/O, no service state) so it can be
+compiled ahead of time with mypyc/Cython without touching the async service.
+"""
+import re
+from typing import Callable, Optional, Union
+
+import orjson
+
+from schemas.alert_lite_pb2 import AlertLite
+from schemas.alerts_pb2 import Alert
+
+# Evaluators only read alert_id, severity, threat_score and reasoning, so the
+# full Alert and its wire-compatible AlertLite projection are interchangeable.
+ProtoAlert = Union[Alert, AlertLite]
+
+Verdict = tuple[str, Optional[dict]]
+
+_MULTI_STAGE_TRUE = re.compile(r'"is_multi_stage"\s*:\s*true')
+
+
+def _evaluate_critical(proto_alert: ProtoAlert) -> Verdict:
+    # Cheap pre-check: only multi-stage alerts need the reasoning decoded. The
+    # correlator always emits the key, so match its value, not just its presence.
+    raw = proto_alert.reasoning
+    if not _MULTI_STAGE_TRUE.search(raw):
+        return "escalate", None
+    reasoning = orjson.loads(raw)
+    # Auto-isolate host for multi-stage critical attacks
+    if reasoning.get("is_multi_stage") and reasoning.get("source"):
+        return "auto_respond", {
+            "action_type": "isolate_host",
+            "reason": reasoning.get("rule", "multi_stage_critical_attack"),
+            "alert_id": proto_alert.alert_id,
+            "source": reasoning.get("source"),
+        }
+    return "escalate", None
+
+
+def _evaluate_high(proto_alert: ProtoAlert) -> Verdict:
+    # Auto-respond if confidence is high (simulated)
+    if proto_alert.threat_score <= 70:
+        return "dismiss", None
+    # Logic to select action based on reasoning; skip the decode when the
+    # only rule we act on can't be in it
+    raw = proto_alert.reasoning
+    if "Brute Force" not in raw:
+        return "auto_respond", None
+    reasoning = orjson.loads(raw)
+    if reasoning.get("rule") == "Brute Force":
+        source_ip = reasoning.get("source_ip")
+        if source_ip:
+            return "auto_respond", {
+                "action_type": "network_block",
+                "target": source_ip,
+                "duration": 3600
+            }
+    return "auto_respond", None
+
+
+def _evaluate_medium(proto_alert: ProtoAlert) -> Verdict:
+    return "escalate", None
+
+
+def _dismiss(proto_alert: ProtoAlert) -> Verdict:
+    return "dismiss", None
+
+
+# severity -> evaluator returning (verdict, action_to_take); anything not listed is
+# dismissed. Lower-case is the canonical form; the upper/title spellings are keyed
+# too so the common cases don't need a .lower() copy per message.
+_SEVERITY_HANDLERS: dict[str, Callable[[ProtoAlert], Verdict]] = {
+    "critical": _evaluate_critical,
+    "high": _evaluate_high,
+    "medium": _evaluate_medium,
+}
+_SEVERITY_DISPATCH: dict[str, Callable[[ProtoAlert], Verdict]] = {
+    spelling: handler
+    for severity, handler in _SEVERITY_HANDLERS.items()
+    for spelling in (severity, severity.upper(), severity.title())
+}
+
+
+def evaluate(proto_alert: ProtoAlert) -> Verdict:
+    """Simple Escalation Policy Logic: pick the severity's evaluator and run it."""
+    severity = proto_alert.severity
+    handler = _SEVERITY_DISPATCH.get(severity) or _SEVERITY_DISPATCH.get(severity.lower(), _dismiss)
+    return handler(proto_alert)
@@ -1,17 +1,93 @@
-import json
+import asyncio
 import logging
+import os
+import time
 import uuid
-from datetime import datetime
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+import orjson
+from sqlalchemy import JSON, bindparam, case, cast, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Protobuf schemas generated successfully
-from schemas.alerts_pb2 import Alert as ProtoAlert
-from ..database.session import async_session_maker
+from schemas.alert_lite_pb2 import AlertLite
+from ..database.base import utc_now
+from ..database.session import async_session_maker, get_engine
 from ..messaging.nats_client import nats_client
 from ..models.action import Action as ActionModel
 from ..service_manager.base_service import BaseService
+from .policy import evaluate
 
 logger = logging.getLogger("n7-core.decision-engine")
 
+# Alerts taken off the queue per worker round, worker count and queue bound
+_ALERT_BATCH_SIZE = 64
+_ALERT_WORKERS = 8
+_ALERT_QUEUE_SIZE = 10_000
+_ALERT_PENDING_LIMIT = 65536
+_ALERT_SUBSCRIPTIONS = 4
+_STATS_INTERVAL = 60  # seconds between alert throughput summaries
+
+# Action status write-behind: max reports per DB batch, how long to wait for a
+# batch to fill (seconds), and the queue bound
+_STATUS_BATCH_SIZE = 100
+_STATUS_BATCH_WINDOW = 0.05
+_STATUS_QUEUE_SIZE = 10_000
+_UNPERSISTED_ACTIONS_MAX = 100_000
+_MAX_INFLIGHT_FLUSHES = 64
+
+_RAND_POOL_BYTES = 4096  # 256 action ids per os.urandom() call
+_ACTIONS_SUBJECT = "n7.actions.broadcast"
+# Fixed shape of an n7.actions.broadcast message; fields are spliced in per dispatch
+_ACTION_TEMPLATE = b'{"action_id":"%b","alert_id":%b,"type":%b,"params":%b,"timestamp":"%b"}'
+
+
+# Existence + merge-base lookup for status reports: primary key and rollback_entry only
+_EXISTING_ACTIONS_STMT = select(
+    ActionModel.id, ActionModel.action_id, ActionModel.rollback_entry
+).where(ActionModel.action_id.in_(bindparam("ids", expanding=True)))
+
+
+def _action_upsert_stmt():
+    """
+    INSERT for actions first seen in a status report. Another decision engine in
+    the queue group may have created the row already, so a conflict on action_id
+    is merged the way an existing row would be: latest status wins, non-empty
+    evidence replaces, and execution results merge into rollback_entry.
+    """
+    stmt = pg_insert(ActionModel)
+    excluded = stmt.excluded
+    empty = cast("{}", JSONB)
+    evidence = func.coalesce(
+        func.nullif(cast(excluded.evidence, JSONB), empty), cast(ActionModel.evidence, JSONB)
+    )
+    rollback_base = case(
+        (func.json_typeof(ActionModel.rollback_entry) == "object", cast(ActionModel.rollback_entry, JSONB)),
+        else_=empty,
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[ActionModel.action_id],
+        set_={
+            "status": excluded.status,
+            "evidence": cast(evidence, JSON),
+            "rollback_entry": cast(rollback_base.op("||")(cast(excluded.rollback_entry, JSONB)), JSON),
+            "updated_at": utc_now(),
+        },
+    )
+
+
+_ACTION_UPSERT_STMT = _action_upsert_stmt()
+
+
+@lru_cache(maxsize=4096)
+def _parse_uuid(value: str) -> uuid.UUID:
+    # Strikers report on ids we (or a peer) dispatched moments ago, often repeatedly
+    return uuid.UUID(value)
+
 
 class DecisionEngineService(BaseService):
     """
@@ -22,108 +98,204 @@ class DecisionEngineService(BaseService):
     def __init__(self):
         super().__init__("DecisionEngineService")
         self._running = False
+        self._alert_q: asyncio.Queue = asyncio.Queue(maxsize=_ALERT_QUEUE_SIZE)
+        self._workers: list[asyncio.Task] = []
+        # Bound NATS methods for the dispatch path, set once connected in start()
+        self._publish = None
+        self._flush = None
+        self._rand_pool = bytearray()
+        self._ts_second = 0
+        self._ts_bytes = b""
+        self._flush_sem = asyncio.Semaphore(_MAX_INFLIGHT_FLUSHES)
+        self._flush_tasks: set[asyncio.Task] = set()
+        self._status_q: asyncio.Queue = asyncio.Queue(maxsize=_STATUS_QUEUE_SIZE)
+        # Action ids this process dispatched that have no actions row yet (FIFO-bounded);
+        # their first status report can be inserted without an existence SELECT.
+        self._unpersisted_actions: OrderedDict[uuid.UUID, None] = OrderedDict()
+        # Per-alert logs are DEBUG (checked once in start()); INFO gets a periodic summary
+        self._debug = False
+        self._alerts_seen = 0
+        self._actions_dispatched = 0
 
     async def start(self):
         self._running = True
+        self._debug = logger.isEnabledFor(logging.DEBUG)
         logger.info("DecisionEngineService started.")
 
         if nats_client.nc and nats_client.nc.is_connected:
-            await nats_client.nc.subscribe(
-                "n7.alerts",
-                cb=self.handle_alert,
-                queue="decision_engine"
-            )
-            logger.info("Subscribed to n7.alerts")
+            self._publish = nats_client.nc.publish
+            self._flush = nats_client.nc.flush
+            self._workers = [
+                asyncio.create_task(self._drain()) for _ in range(_ALERT_WORKERS)
+            ]
+            # Several members of the same queue group: the server round-robins
+            # alerts across them, and each gets its own client-side delivery task.
+            for _ in range(_ALERT_SUBSCRIPTIONS):
+                await nats_client.nc.subscribe(
+                    "n7.alerts",
+                    cb=self.handle_alert,
+                    queue="decision_engine",
+                    pending_msgs_limit=_ALERT_PENDING_LIMIT,
+                )
+            logger.info(f"Subscribed to n7.alerts ({_ALERT_SUBSCRIPTIONS} queue subscriptions)")
 
+            self._workers.append(asyncio.create_task(self._write_statuses()))
+            self._workers.append(asyncio.create_task(self._log_stats()))
             await nats_client.nc.subscribe(
                 "n7.actions.status",
                 cb=self.handle_action_status,
                 queue="decision_engine_action_status"
             )
             logger.info("Subscribed to n7.actions.status")
+            # Round-trip to the server so both subscriptions are registered before
+            # start() returns, rather than on the client's next pending flush.
+            await nats_client.nc.flush()
         else:
             logger.warning("NATS not connected, DecisionEngineService waiting...")
 
     async def stop(self):
         self._running = False
+        for task in (*self._workers, *self._flush_tasks):
+            task.cancel()
+        self._workers = []
         logger.info("DecisionEngineService stopped.")
 
     async def handle_alert(self, msg):
+        """NATS callback for n7.alerts: hand the message to the worker pool."""
+        try:
+            self._alert_q.put_nowait(msg)
+        except asyncio.QueueFull:
+            logger.warning("Alert queue full, dropping alert (decision engine is falling behind)")
+
+    async def _drain(self):
+        """
+        Worker loop: wait for one alert, then take whatever else is already queued
+        (up to _ALERT_BATCH_SIZE), evaluate the batch, publish every resulting
+        action and flush once for the whole batch (without waiting on it).
+        """
+        # One message object per worker, re-filled for each alert: ParseFromString
+        # clears it first, and evaluators only copy scalar fields out of it.
+        # AlertLite declares just the four fields the policy reads; the rest of the
+        # Alert (event_ids, affected_assets, ...) stays as undecoded unknown bytes.
+        proto_alert = AlertLite()
+        while self._running:
+            batch = [await self._alert_q.get()]
+            while len(batch) < _ALERT_BATCH_SIZE:
+                try:
+                    batch.append(self._alert_q.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            dispatches = [d for d in (self._evaluate_alert(m, proto_alert) for m in batch) if d is not None]
+            if not dispatches:
+                continue
+            publish = self._publish
+            try:
+                # Publish to broadcast subject so any capable striker handles it
+                for action_id, action_type, data in dispatches:
+                    await publish(_ACTIONS_SUBJECT, data)
+                    logger.info(f"Dispatched action {action_id}: {action_type} via broadcast")
+                self._actions_dispatched += len(dispatches)
+            except Exception as e:
+                logger.error(f"Error dispatching actions: {e}", exc_info=True)
+                continue
+
+            # Confirm delivery in the background so this worker can take the next
+            # batch instead of idling for the PING/PONG; the semaphore bounds how
+            # many confirmations may be outstanding (and backpressures when full).
+            await self._flush_sem.acquire()
+            task = asyncio.create_task(self._confirm_flush())
+            self._flush_tasks.add(task)
+            task.add_done_callback(self._flush_tasks.discard)
+
+    async def _log_stats(self):
+        """Summarise alert throughput at INFO in place of per-alert log lines."""
+        while self._running:
+            await asyncio.sleep(_STATS_INTERVAL)
+            if self._alerts_seen:
+                logger.info(
+                    f"Evaluated {self._alerts_seen} alerts, dispatched {self._actions_dispatched} "
+                    f"actions in the last {_STATS_INTERVAL}s"
+                )
+                self._alerts_seen = 0
+                self._actions_dispatched = 0
+
+    async def _confirm_flush(self):
+        try:
+            await self._flush()
+        except Exception as e:
+            logger.error(f"Error flushing dispatched actions: {e}")
+        finally:
+            self._flush_sem.release()
+
+    def _next_action_id(self) -> uuid.UUID:
+        """uuid4 drawn from a pooled os.urandom block: one syscall per 256 ids."""
+        if not self._rand_pool:
+            self._rand_pool = bytearray(os.urandom(_RAND_POOL_BYTES))
+        raw = bytes(self._rand_pool[-16:])
+        del self._rand_pool[-16:]
+        return uuid.UUID(bytes=raw, version=4)
+
+    def _timestamp(self) -> bytes:
+        """Dispatch timestamp (UTC ISO-8601, whole seconds), formatted once per second."""
+        now = int(time.time())
+        if now != self._ts_second:
+            self._ts_second = now
+            self._ts_bytes = datetime.fromtimestamp(now, timezone.utc).replace(tzinfo=None).isoformat().encode()
+        return self._ts_bytes
+
+    def _evaluate_alert(self, msg, proto_alert: AlertLite) -> Optional[tuple[uuid.UUID, str, bytes]]:
+        """
+        Decide on one alert. Returns (action_id, action_type, encoded payload) when
+        an action should be dispatched, else None.
+        """
         try:
-            proto_alert = ProtoAlert()
             proto_alert.ParseFromString(msg.data)
 
-            logger.info(f"Received alert: {proto_alert.alert_id} severity={proto_alert.severity}")
+            alert_id = proto_alert.alert_id
+            severity = proto_alert.severity
+            self._alerts_seen += 1
+            if self._debug:
+                logger.debug(f"Received alert: {alert_id} severity={severity}")
 
             # Simple Escalation Policy Logic
-            severity = proto_alert.severity.lower()
-            verdict = "dismiss"
-            action_to_take = None
-
-            if severity == "critical":
-                verdict = "escalate"
-                reasoning = json.loads(proto_alert.reasoning) if proto_alert.reasoning else {}
-                # Auto-isolate host for multi-stage critical attacks
-                if reasoning.get("is_multi_stage") and reasoning.get("source"):
-                    verdict = "auto_respond"
-                    action_to_take = {
-                        "action_type": "isolate_host",
-                        "reason": reasoning.get("rule", "multi_stage_critical_attack"),
-                        "alert_id": proto_alert.alert_id,
-                        "source": reasoning.get("source"),
-                    }
-            elif severity == "high":
-                # Auto-respond if confidence is high (simulated)
-                if proto_alert.threat_score > 70:
-                    verdict = "auto_respond"
-                    # Logic to select action based on reasoning
-                    reasoning = json.loads(proto_alert.reasoning) if proto_alert.reasoning else {}
-                    if reasoning.get("rule") == "Brute Force":
-                        source_ip = reasoning.get("source_ip")
-                        if source_ip:
-                            action_to_take = {
-                                "action_type": "network_block",
-                                "target": source_ip,
-                                "duration": 3600
-                            }
-            elif severity == "medium":
-                verdict = "escalate"
-
-            logger.info(f"Verdict for {proto_alert.alert_id}: {verdict}")
+            verdict, action_to_take = evaluate(proto_alert)
+
+            if self._debug:
+                logger.debug(f"Verdict for {alert_id}: {verdict}")
 
             # Persist verdict update (Optional for MVP speed, logic usually updates db_alert)
 
-            # Dispatch Action
             if verdict == "auto_respond" and action_to_take:
-                action_id = str(uuid.uuid4())
-                action_payload = {
-                    "action_id": action_id,
-                    "alert_id": proto_alert.alert_id,
-                    "type": action_to_take["action_type"],
-                    "params": action_to_take,
-                    "timestamp": datetime.utcnow().isoformat()
-                }
-
-                # Publish to broadcast subject so any capable striker handles it
-                if nats_client.nc:
-                    await nats_client.nc.publish(
-                        "n7.actions.broadcast",
-                        json.dumps(action_payload).encode()
-                    )
-                    logger.info(f"Dispatched action {action_id}: {action_to_take['action_type']} via broadcast")
-
+                action_id = self._next_action_id()
+                action_type = action_to_take["action_type"]
+                self._unpersisted_actions[action_id] = None
+                if len(self._unpersisted_actions) > _UNPERSISTED_ACTIONS_MAX:
+                    self._unpersisted_actions.popitem(last=False)
+                # Only the variable parts go through the encoder; alert_id/type are
+                # JSON-encoded (quoted + escaped) since they come off the wire.
+                data = _ACTION_TEMPLATE % (
+                    str(action_id).encode(),
+                    orjson.dumps(alert_id),
+                    orjson.dumps(action_type),
+                    orjson.dumps(action_to_take),
+                    self._timestamp(),
+                )
+                return action_id, action_type, data
         except Exception as e:
             logger.error(f"Error processing alert: {e}", exc_info=True)
+        return None
 
     async def handle_action_status(self, msg):
         """
         Receive action completion reports from Strikers on n7.actions.status.
-        Persists the final status, result, and forensic evidence into the actions table.
+        Decodes the report and queues it for _write_statuses, which persists the final
+        status, result, and forensic evidence into the actions table in batches.
         """
         try:
             # Try JSON (primary format); Protobuf actions have result_data as a JSON string
             try:
-                data = json.loads(msg.data.decode())
+                data = orjson.loads(msg.data)
             except Exception:
                 # Fallback: Protobuf serialized — try to parse action_id and status from ProtoAction
                 try:
@@ -131,7 +303,7 @@ class DecisionEngineService(BaseService):
                     pa = ProtoAction()
                     pa.ParseFromString(msg.data)
                     result_raw = pa.result_data or "{}"
-                    inner = json.loads(result_raw)
+                    inner = orjson.loads(result_raw)
                     data = {
                         "action_id": pa.action_id,
                         "striker_id": pa.striker_id,
@@ -149,48 +321,146 @@ class DecisionEngineService(BaseService):
                 logger.warning("handle_action_status: missing action_id in payload")
                 return
 
-            status = data.get("status", "unknown")
-            result_data = data.get("result_data", {})
-            evidence = data.get("evidence", {})
-
+            # Defaulted here so a null or non-string field can't fail the row
+            # (action_type is NOT NULL) and with it the rest of its batch.
+            status = data.get("status")
+            if not isinstance(status, str) or not status:
+                status = "unknown"
+            action_type = data.get("action_type")
+            if not isinstance(action_type, str) or not action_type:
+                action_type = "unknown"
+            result_data = data.get("result_data")
+            evidence = data.get("evidence")
             logger.info(f"Action status received: {action_id_str} → {status}")
 
-            async with async_session_maker() as session:
-                from sqlalchemy import select
-                result = await session.execute(
-                    select(ActionModel).where(
-                        ActionModel.action_id == uuid.UUID(action_id_str)
-                    )
-                )
-                action = result.scalar_one_or_none()
-
-                if action is None:
-                    # Action was dispatched without a prior DB row (decision engine auto-dispatch).
-                    # Create a record now from the status report.
-                    action = ActionModel(
-                        action_id=uuid.UUID(action_id_str),
-                        action_type=data.get("action_type", "unknown"),
-                        status=status,
-                        initiated_by="auto",
-                        parameters={},
-                        evidence=evidence,
-                        rollback_entry={},
-                    )
-                    session.add(action)
-                    logger.info(f"Created action record from status report for {action_id_str}")
-                else:
-                    action.status = status
-                    if evidence:
-                        action.evidence = evidence
-                    if result_data:
-                        # Merge result data into rollback_entry field (already a JSON blob)
-                        action.rollback_entry = {
-                            **(action.rollback_entry or {}),
-                            "execution_result": result_data,
-                        }
-
-                await session.commit()
-                logger.debug(f"Persisted action status for {action_id_str}: {status}")
-
+            self._status_q.put_nowait((
+                _parse_uuid(action_id_str),
+                action_type,
+                status,
+                result_data if isinstance(result_data, dict) else {},
+                evidence if isinstance(evidence, dict) else {},
+            ))
+        except asyncio.QueueFull:
+            logger.warning("Action status queue full, dropping status report (DB writer is falling behind)")
         except Exception as e:
             logger.error(f"Error processing action status: {e}", exc_info=True)
+
+    async def _write_statuses(self):
+        """
+        Write-behind for n7.actions.status: collect up to _STATUS_BATCH_SIZE reports
+        (or whatever arrives within _STATUS_BATCH_WINDOW of the first) and persist
+        them in one transaction — one SELECT ... IN and one COMMIT per batch instead
+        of a SELECT + COMMIT round-trip pair per message.
+
+        The writer keeps one pooled connection and session for its lifetime (no
+        per-batch checkout / pre-ping); if the connection breaks it is reopened.
+        """
+        while self._running:
+            try:
+                async with get_engine().connect() as conn, async_session_maker(bind=conn) as session:
+                    while self._running:
+                        batch = await self._collect_statuses()
+                        if not await self._persist_batch(session, batch, conn):
+                            break
+            except Exception as e:
+                logger.error(f"Action status writer lost its DB connection, reconnecting: {e}")
+                await asyncio.sleep(1)
+
+    async def _persist_batch(self, session: AsyncSession, batch: list, conn) -> bool:
+        """
+        Persist a batch in one transaction. If that fails, retry it one report per
+        transaction so a single bad report is dropped rather than the whole batch.
+        Returns False once the connection is invalidated (the caller reconnects).
+        """
+        try:
+            await self._persist_statuses(session, batch)
+            return True
+        except Exception as e:
+            await session.rollback()
+            if conn.invalidated:
+                logger.error(f"Error persisting {len(batch)} action statuses: {e}", exc_info=True)
+                return False
+            if len(batch) == 1:
+                logger.error(f"Dropping action status for {batch[0][0]}: {e}", exc_info=True)
+                return True
+            logger.warning(f"Error persisting {len(batch)} action statuses, retrying one at a time: {e}")
+
+        for report in batch:
+            try:
+                await self._persist_statuses(session, [report])
+            except Exception as e:
+                await session.rollback()
+                if conn.invalidated:
+                    logger.error(f"Error persisting action statuses: {e}", exc_info=True)
+                    return False
+                logger.error(f"Dropping action status for {report[0]}: {e}", exc_info=True)
+        return True
+
+    async def _collect_statuses(self) -> list:
+        loop = asyncio.get_running_loop()
+        batch = [await self._status_q.get()]
+        deadline = loop.time() + _STATUS_BATCH_WINDOW
+        while len(batch) < _STATUS_BATCH_SIZE:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._status_q.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _persist_statuses(self, session: AsyncSession, batch: list):
+        # Ids we dispatched ourselves usually have no row yet, so skip the lookup for
+        # them; a peer in the queue group may still have created one, which the
+        # upsert below absorbs.
+        batch_ids = {action_id for action_id, *_ in batch}
+        fresh = {action_id for action_id in batch_ids if action_id in self._unpersisted_actions}
+        unknown = batch_ids - fresh
+
+        # Rows as plain column dicts: only the key and the blob we merge into are
+        # read, and the writes go out as bulk INSERT / bulk UPDATE-by-primary-key.
+        existing = {}
+        if unknown:
+            result = await session.execute(_EXISTING_ACTIONS_STMT, {"ids": list(unknown)})
+            existing = {row.action_id: dict(row._mapping) for row in result}
+        created = {}
+
+        # Applied in arrival order, so later reports for the same action win
+        for action_id, action_type, status, result_data, evidence in batch:
+            row = existing.get(action_id) or created.get(action_id)
+            if row is None:
+                # Action was dispatched without a prior DB row (decision engine auto-dispatch).
+                # Create a record now from the status report.
+                created[action_id] = {
+                    "action_id": action_id,
+                    "action_type": action_type,
+                    "status": status,
+                    "initiated_by": "auto",
+                    "parameters": {},
+                    "evidence": evidence or {},
+                    "rollback_entry": {},
+                }
+                logger.info(f"Created action record from status report for {action_id}")
+                continue
+            row["status"] = status
+            if evidence:
+                row["evidence"] = evidence
+            if result_data:
+                # Merge result data into rollback_entry field (a JSON object, unless
+                # something else wrote a non-object there, which is replaced)
+                base = row["rollback_entry"]
+                row["rollback_entry"] = {
+                    **(base if isinstance(base, dict) else {}),
+                    "execution_result": result_data,
+                }
+
+        if created:
+            await session.execute(_ACTION_UPSERT_STMT, list(created.values()))
+        if existing:
+            await session.execute(update(ActionModel), list(existing.values()))
+        await session.commit()
+        # Only now do these ids have a row; if the write failed they stay fresh
+        for action_id in fresh:
+            self._unpersisted_actions.pop(action_id, None)
+        logger.debug(f"Persisted {len(batch)} action status reports")
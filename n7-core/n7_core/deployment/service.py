@@ -3,49 +3,95 @@ import base64
 import hashlib
 import ipaddress
 import logging
+import platform
+import re
+import subprocess
 from datetime import datetime
+from functools import lru_cache
 from uuid import UUID
 
 import asyncssh
-from icmplib import async_ping
-from sqlalchemy import select
+from cryptography.fernet import Fernet
+from icmplib import async_multiping
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from ..config_sync.service import ConfigSyncService
 from ..database.session import async_session_maker
 from ..models.infra_node import InfraNode
 from ..service_manager.base_service import BaseService
-from ..config import settings
+from ..config import get_settings
 
 logger = logging.getLogger("n7-core.deployment")
 
+# Per agent type: (pip package, python module, capabilities provisioned in its config)
+_AGENT_SPECS: dict[str, tuple[str, str, tuple[str, ...]]] = {
+    "sentinel": ("n7-sentinels", "n7_sentinels", ("system_probe", "file_integrity")),
+    "striker": (
+        "n7-strikers", "n7_strikers",
+        ("kill_process", "block_ip", "isolate_host", "unisolate_host"),
+    ),
+}
 
+_SSH_IDLE_TIMEOUT = 60  # seconds a pooled SSH connection may sit unused before it is closed
+
+
+def _ssh_credential_fingerprint(connect_kwargs: dict) -> str:
+    """Pool-key component for the credential a connection authenticated with (no plaintext)."""
+    if "client_keys" in connect_kwargs:
+        return "key:" + ",".join(map(str, connect_kwargs["client_keys"]))
+    return "pw:" + hashlib.sha256(connect_kwargs.get("password", "").encode()).hexdigest()
+
+
+@lru_cache(maxsize=1)
 def _derive_fernet_key(secret: str) -> bytes:
     """Derive a 32-byte URL-safe base64 Fernet key from the application secret."""
     digest = hashlib.sha256(secret.encode()).digest()
     return base64.urlsafe_b64encode(digest)
 
 
-def _arp_lookup(ip: str) -> str | None:
+@lru_cache(maxsize=1)
+def _get_fernet(secret: str) -> Fernet:
+    """Shared Fernet instance per secret; built on first use so import never reads settings."""
+    return Fernet(_derive_fernet_key(secret))
+
+
+_MAC_RE = re.compile(r"([\da-fA-F]{2}[-:]){5}[\da-fA-F]{2}")
+_IPV4_RE = re.compile(r"\d{1,3}(?:\.\d{1,3}){3}")
+
+
+def _load_arp_table() -> dict[str, str]:
     """
-    Look up the MAC address for a given IP from the OS ARP cache.
-    Works only for hosts on the same local subnet (populated after a ping).
-    Returns None if not found or the platform is unsupported.
+    Snapshot the OS ARP cache as {ip: MAC}.
+    Reads /proc/net/arp directly on Linux; elsewhere runs a single `arp -a`.
+    Only local-subnet hosts appear (entries are populated by the preceding ping sweep).
+    Returns an empty dict if the table cannot be read.
     """
-    import subprocess
-    import re
-    import platform
+    table: dict[str, str] = {}
     try:
-        if platform.system() == "Windows":
-            out = subprocess.check_output(["arp", "-a", ip], text=True, timeout=3)
-            # Windows arp output: "  192.168.1.1   aa-bb-cc-dd-ee-ff  dynamic"
-            match = re.search(r"([\da-fA-F]{2}[-:]){5}[\da-fA-F]{2}", out)
-        else:
-            out = subprocess.check_output(["arp", "-n", ip], text=True, timeout=3)
-            # Linux/macOS output: "? (192.168.1.1) at aa:bb:cc:dd:ee:ff [ether] ..."
-            match = re.search(r"([\da-fA-F]{2}:){5}[\da-fA-F]{2}", out)
-        return match.group(0).upper() if match else None
+        with open("/proc/net/arp") as f:
+            next(f, None)  # header row
+            for line in f:
+                fields = line.split()
+                # IP address, HW type, Flags, HW address, Mask, Device; flags 0x0 = incomplete
+                if len(fields) >= 4 and fields[2] != "0x0":
+                    table[fields[0]] = fields[3].upper()
+        return table
+    except OSError:
+        pass
+    try:
+        args = ["arp", "-a"] if platform.system() == "Windows" else ["arp", "-an"]
+        out = subprocess.check_output(args, text=True, timeout=3)
     except Exception:
-        return None
+        return table
+    # Windows: "  192.168.1.1   aa-bb-cc-dd-ee-ff  dynamic"
+    # Linux/macOS: "? (192.168.1.1) at aa:bb:cc:dd:ee:ff [ether] ..."
+    for line in out.splitlines():
+        ip_match = _IPV4_RE.search(line)
+        mac_match = _MAC_RE.search(line)
+        if ip_match and mac_match:
+            table[ip_match.group(0)] = mac_match.group(0).upper()
+    return table
 
 
 class DeploymentService(BaseService):
@@ -57,14 +103,29 @@ class DeploymentService(BaseService):
 
     def __init__(self):
         super().__init__("DeploymentService")
-        from cryptography.fernet import Fernet
-        self._fernet = Fernet(_derive_fernet_key(settings.SECRET_KEY))
+        self._fernet = _get_fernet(get_settings().SECRET_KEY)
+        # Keyed by ciphertext: a changed credential is a new token and simply misses,
+        # so redeploys to a known node skip Fernet entirely. Plaintext stays in-process.
+        self._decrypt_cached = lru_cache(maxsize=1024)(self._decrypt)
         self._config_sync = ConfigSyncService()
+        # (host, port, username, credential fingerprint) -> [connection, last_used, active_users]
+        self._ssh_pool: dict[tuple[str, int, str, str], list] = {}
+        self._ssh_locks: dict[tuple[str, int, str, str], asyncio.Lock] = {}
+        # Entries evicted while deploys were still using them; closed on last release
+        self._ssh_evicted: list[list] = []
+        self._ssh_reaper: asyncio.Task | None = None
 
     async def start(self):
         logger.info("DeploymentService started.")
 
     async def stop(self):
+        if self._ssh_reaper:
+            self._ssh_reaper.cancel()
+            self._ssh_reaper = None
+        for conn, *_ in (*self._ssh_pool.values(), *self._ssh_evicted):
+            conn.close()
+        self._ssh_pool.clear()
+        self._ssh_evicted.clear()
         logger.info("DeploymentService stopped.")
 
     # ------------------------------------------------------------------ #
@@ -75,6 +136,9 @@ class DeploymentService(BaseService):
         return self._fernet.encrypt(plain.encode()).decode()
 
     def decrypt_credential(self, enc: str) -> str:
+        return self._decrypt_cached(enc)
+
+    def _decrypt(self, enc: str) -> str:
         return self._fernet.decrypt(enc.encode()).decode()
 
     # ------------------------------------------------------------------ #
@@ -87,22 +151,18 @@ class DeploymentService(BaseService):
         MAC addresses are resolved via ARP table (available for local-subnet hosts only).
         """
         hosts = [str(ip) for ip in ipaddress.IPv4Network(cidr, strict=False).hosts()]
-        # Batch to avoid opening too many sockets at once
-        batch_size = 50
-        reachable = []
-        for i in range(0, len(hosts), batch_size):
-            batch = hosts[i:i + batch_size]
-            tasks = [async_ping(ip, count=1, timeout=1, privileged=False) for ip in batch]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for ip, result in zip(batch, results):
-                if isinstance(result, Exception):
-                    continue
-                if result.is_alive:
-                    reachable.append({
-                        "ip_address": ip,
-                        "hostname": None,
-                        "mac_address": _arp_lookup(ip),
-                    })
+        results = await async_multiping(
+            hosts, count=1, timeout=1, concurrent_tasks=256, privileged=False
+        )
+        reachable = [
+            {"ip_address": result.address, "hostname": None, "mac_address": None}
+            for result in results if result.is_alive
+        ]
+        # One ARP snapshot for the whole sweep instead of an `arp` fork per host
+        if reachable:
+            arp_table = await asyncio.to_thread(_load_arp_table)
+            for host in reachable:
+                host["mac_address"] = arp_table.get(host["ip_address"])
         return reachable
 
     async def scan_network_nmap(self, cidr: str, timeout: int = 30) -> list[dict]:
@@ -132,37 +192,42 @@ class DeploymentService(BaseService):
 
     async def persist_discovered_nodes(self, hosts: list[dict], method: str) -> list[InfraNode]:
         """
-        Upsert discovered hosts into infra_nodes.
+        Upsert discovered hosts into infra_nodes in one INSERT ... ON CONFLICT.
         Updates last_seen for existing entries; inserts new ones.
+        Returns the rows in scan order.
         """
-        nodes = []
+        # One row per IP: a single INSERT ... ON CONFLICT can't touch the same row twice
+        rows = {}
+        for host in hosts:
+            rows.setdefault(host["ip_address"], {
+                "ip_address": host["ip_address"],
+                "hostname": host.get("hostname"),
+                "mac_address": host.get("mac_address"),
+                "status": "reachable",
+                "discovery_method": method,
+            })
+        if not rows:
+            return []
+
+        # Single round-trip upsert: new IPs are inserted; existing ones get last_seen
+        # and status refreshed, and keep their MAC unless they didn't have one yet.
+        stmt = pg_insert(InfraNode).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[InfraNode.ip_address],
+            set_={
+                "last_seen": datetime.utcnow(),
+                "status": "reachable",
+                "mac_address": func.coalesce(InfraNode.mac_address, stmt.excluded.mac_address),
+            },
+        ).returning(InfraNode)
+
         async with async_session_maker() as session:
-            for host in hosts:
+            async with session.begin():
                 result = await session.execute(
-                    select(InfraNode).where(InfraNode.ip_address == host["ip_address"])
+                    stmt, execution_options={"populate_existing": True}
                 )
-                existing = result.scalar_one_or_none()
-                if existing:
-                    existing.last_seen = datetime.utcnow()
-                    existing.status = "reachable"
-                    # Update MAC if we now have one and didn't before
-                    if host.get("mac_address") and not existing.mac_address:
-                        existing.mac_address = host["mac_address"]
-                    nodes.append(existing)
-                else:
-                    node = InfraNode(
-                        ip_address=host["ip_address"],
-                        hostname=host.get("hostname"),
-                        mac_address=host.get("mac_address"),
-                        status="reachable",
-                        discovery_method=method,
-                    )
-                    session.add(node)
-                    nodes.append(node)
-            await session.commit()
-            for n in nodes:
-                await session.refresh(n)
-        return nodes
+                by_ip = {node.ip_address: node for node in result.scalars()}
+        return [by_ip[ip] for ip in rows if ip in by_ip]
 
     # ------------------------------------------------------------------ #
     #  Deployment Orchestration                                            #
@@ -185,10 +250,7 @@ class DeploymentService(BaseService):
         Updates InfraNode.deployment_status throughout execution.
         """
         async with async_session_maker() as session:
-            result = await session.execute(
-                select(InfraNode).where(InfraNode.id == UUID(node_id))
-            )
-            node = result.scalar_one_or_none()
+            node = await session.get(InfraNode, UUID(node_id))
             if not node:
                 logger.error(f"deploy_agent: node {node_id} not found")
                 return
@@ -224,17 +286,13 @@ class DeploymentService(BaseService):
                 # Provision centralized config in DB so the agent can pull it on startup
                 if node.deployed_agent_id:
                     try:
-                        from uuid import UUID as _UUID
-                        capabilities = (
-                            ["system_probe", "file_integrity"] if agent_type == "sentinel"
-                            else ["kill_process", "block_ip", "isolate_host", "unisolate_host"]
-                        )
                         await self._config_sync.provision_agent_config(
-                            agent_id=_UUID(node.deployed_agent_id),
+                            agent_id=UUID(node.deployed_agent_id),
+                            agent_type=agent_type,
                             nats_url=nats_url,
                             core_api_url=core_api_url,
                             zone=zone,
-                            capabilities=capabilities,
+                            capabilities=list(_AGENT_SPECS[agent_type][2]),
                         )
                     except Exception as cfg_err:
                         logger.warning(
@@ -249,6 +307,71 @@ class DeploymentService(BaseService):
 
             await session.commit()
 
+    # ------------------------------------------------------------------ #
+    #  SSH Connection Pool                                                 #
+    # ------------------------------------------------------------------ #
+
+    async def _get_ssh_conn(self, connect_kwargs: dict) -> asyncssh.SSHClientConnection:
+        """
+        Return a pooled connection for (host, port, username, credential), opening one
+        if needed. Deployments to the same host multiplex sessions over a single
+        connection; the credential is part of the key so a deploy with different (or
+        wrong) credentials authenticates on its own instead of reusing another's.
+        """
+        key = (
+            connect_kwargs["host"], connect_kwargs["port"], connect_kwargs["username"],
+            _ssh_credential_fingerprint(connect_kwargs),
+        )
+        lock = self._ssh_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._ssh_pool.get(key)
+            if entry and not entry[0].is_closed():
+                entry[2] += 1
+                return entry[0]
+            conn = await asyncssh.connect(**connect_kwargs)
+            self._ssh_pool[key] = [conn, asyncio.get_running_loop().time(), 1]
+        if self._ssh_reaper is None or self._ssh_reaper.done():
+            self._ssh_reaper = asyncio.create_task(self._reap_idle_ssh())
+        return conn
+
+    def _drop_ssh_conn(self, conn: asyncssh.SSHClientConnection):
+        """
+        Evict a pooled connection (e.g. after a transport error) so later deploys
+        open a fresh one. Deploys still running on it keep it; the last
+        _release_ssh_conn closes it.
+        """
+        for key, entry in list(self._ssh_pool.items()):
+            if entry[0] is conn:
+                del self._ssh_pool[key]
+                self._ssh_evicted.append(entry)
+
+    def _release_ssh_conn(self, conn: asyncssh.SSHClientConnection):
+        """Return a pooled connection; its idle timer starts from release."""
+        now = asyncio.get_running_loop().time()
+        for entry in self._ssh_pool.values():
+            if entry[0] is conn:
+                entry[1] = now
+                entry[2] -= 1
+                return
+        for entry in self._ssh_evicted:
+            if entry[0] is conn:
+                entry[2] -= 1
+                if entry[2] <= 0:
+                    self._ssh_evicted.remove(entry)
+                    conn.close()
+                return
+
+    async def _reap_idle_ssh(self):
+        """Close pooled connections idle for longer than _SSH_IDLE_TIMEOUT; exits when the pool is empty."""
+        while self._ssh_pool:
+            await asyncio.sleep(_SSH_IDLE_TIMEOUT / 2)
+            now = asyncio.get_running_loop().time()
+            for key, (conn, last_used, active) in list(self._ssh_pool.items()):
+                if conn.is_closed() or (not active and now - last_used > _SSH_IDLE_TIMEOUT):
+                    del self._ssh_pool[key]
+                    conn.close()
+                    logger.debug(f"Closed idle SSH connection to {key[0]}:{key[1]}")
+
     # ------------------------------------------------------------------ #
     #  SSH Deployment (Linux / macOS)                                      #
     # ------------------------------------------------------------------ #
@@ -263,8 +386,7 @@ class DeploymentService(BaseService):
         if not password and not key_path:
             raise ValueError("Either SSH password or key path is required.")
 
-        repo_package = "n7-sentinels" if agent_type == "sentinel" else "n7-strikers"
-        module_name = "n7_sentinels" if agent_type == "sentinel" else "n7_strikers"
+        repo_package, module_name, _ = _AGENT_SPECS[agent_type]
         install_dir = f"/opt/n7/{agent_type}"
         service_name = f"n7-{agent_type}"
 
@@ -303,47 +425,36 @@ WantedBy=multi-user.target
         else:
             connect_kwargs["password"] = password
 
-        commands = [
-            "python3 -m ensurepip --upgrade 2>/dev/null || true",
-            "python3 -m pip install --quiet virtualenv",
-            f"mkdir -p {install_dir}",
-            f"python3 -m venv {install_dir}/venv",
-            f"{install_dir}/venv/bin/pip install --quiet {repo_package}",
-        ]
-
-        async with asyncssh.connect(**connect_kwargs) as conn:
-            for cmd in commands:
-                result = await conn.run(cmd, check=False)
-                if result.exit_status != 0:
-                    raise RuntimeError(
-                        f"Command failed (exit {result.exit_status}): {cmd!r}\n"
-                        f"stderr: {result.stderr}"
-                    )
-
-            # Write .env file
-            async with conn.start_sftp_client() as sftp:
-                async with sftp.open(f"{install_dir}/.env", "w") as f:
-                    await f.write(env_contents)
+        unit_path = f"/etc/systemd/system/{service_name}.service"
+        # Whole provisioning run as one script over a single channel: one round-trip
+        # instead of one per command plus an SFTP session. Quoted heredocs keep the
+        # .env and unit contents literal.
+        script = (
+            "set -euo pipefail\n"
+            "python3 -m ensurepip --upgrade 2>/dev/null || true\n"
+            "python3 -m pip install --quiet virtualenv\n"
+            f"mkdir -p {install_dir}\n"
+            f"python3 -m venv {install_dir}/venv\n"
+            f"{install_dir}/venv/bin/pip install --quiet {repo_package}\n"
+            f"cat > {install_dir}/.env <<'N7EOF'\n{env_contents}N7EOF\n"
+            f"sudo tee {unit_path} > /dev/null <<'N7EOF'\n{systemd_unit}N7EOF\n"
+            "sudo systemctl daemon-reload\n"
+            f"sudo systemctl enable --now {service_name}\n"
+        )
 
-            # Write systemd unit and enable the service
-            unit_path = f"/etc/systemd/system/{service_name}.service"
-            result = await conn.run(
-                f"echo {asyncssh.quote(systemd_unit)} | sudo tee {unit_path} > /dev/null",
-                check=False
-            )
+        conn = await self._get_ssh_conn(connect_kwargs)
+        try:
+            result = await conn.run("bash -s", input=script, check=False)
             if result.exit_status != 0:
-                raise RuntimeError(f"Failed to write systemd unit: {result.stderr}")
-
-            for cmd in [
-                "sudo systemctl daemon-reload",
-                f"sudo systemctl enable --now {service_name}",
-            ]:
-                result = await conn.run(cmd, check=False)
-                if result.exit_status != 0:
-                    raise RuntimeError(
-                        f"Command failed (exit {result.exit_status}): {cmd!r}\n"
-                        f"stderr: {result.stderr}"
-                    )
+                raise RuntimeError(
+                    f"Provisioning script failed (exit {result.exit_status})\n"
+                    f"stderr: {result.stderr}"
+                )
+        except (asyncssh.Error, OSError):
+            self._drop_ssh_conn(conn)
+            raise
+        finally:
+            self._release_ssh_conn(conn)
 
         logger.info(f"SSH deployment of {agent_type} to {node.ip_address} completed.")
 
@@ -359,8 +470,7 @@ WantedBy=multi-user.target
         if not username or not password:
             raise ValueError("SSH username and password are required for WinRM deployment.")
 
-        repo_package = "n7-sentinels" if agent_type == "sentinel" else "n7-strikers"
-        module_name = "n7_sentinels" if agent_type == "sentinel" else "n7_strikers"
+        repo_package, module_name, _ = _AGENT_SPECS[agent_type]
         install_dir = f"C:\\N7\\{agent_type}"
         service_name = f"n7-{agent_type}"
 
@@ -381,6 +491,14 @@ WantedBy=multi-user.target
             f'nssm start {service_name}',
         ]
 
+        # One run_ps call = one WSMan shell and one PowerShell start-up for the whole
+        # install. Native tools (python, pip, nssm) don't throw on failure, so each
+        # step checks $LASTEXITCODE itself.
+        script = "$ErrorActionPreference = 'Stop'\n" + "\n".join(
+            f"{ps_cmd}\nif ($LASTEXITCODE) {{ throw \"step {step} failed with exit code $LASTEXITCODE\" }}"
+            for step, ps_cmd in enumerate(ps_commands, 1)
+        )
+
         def _run():
             import winrm
             session = winrm.Session(
@@ -388,13 +506,12 @@ WantedBy=multi-user.target
                 auth=(username, password),
                 transport="ntlm",
             )
-            for ps_cmd in ps_commands:
-                result = session.run_ps(ps_cmd)
-                if result.status_code != 0:
-                    raise RuntimeError(
-                        f"WinRM command failed ({result.status_code}): {ps_cmd!r}\n"
-                        f"stderr: {result.std_err.decode()}"
-                    )
+            result = session.run_ps(script)
+            if result.status_code != 0:
+                raise RuntimeError(
+                    f"WinRM provisioning script failed ({result.status_code})\n"
+                    f"stderr: {result.std_err.decode()}"
+                )
 
         await asyncio.to_thread(_run)
         logger.info(f"WinRM deployment of {agent_type} to {node.ip_address} completed.")
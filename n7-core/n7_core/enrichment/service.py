@@ -1,10 +1,17 @@
 import logging
+import time
+from collections import OrderedDict
 from typing import Dict
 
 from ..service_manager.base_service import BaseService
 
 logger = logging.getLogger("n7-core.enrichment")
 
+# raw_data fields ThreatIntelService inspects; together they fully determine its result
+_IOC_FIELDS = ("source_ip", "destination_ip", "domain", "file_hash", "url")
+_TI_CACHE_SIZE = 10_000
+_TI_CACHE_TTL = 60  # seconds; bounds how long a newly added IOC can go unmatched
+
 
 class EnrichmentService(BaseService):
     """
@@ -17,6 +24,8 @@ class EnrichmentService(BaseService):
         super().__init__("EnrichmentService")
         self._running = False
         self.threat_intel_service = None  # Will be injected
+        # IOC-field tuple -> (expires_at, threat intel enrichments), LRU-ordered
+        self._ti_cache: OrderedDict = OrderedDict()
 
     async def start(self):
         self._running = True
@@ -47,8 +56,7 @@ class EnrichmentService(BaseService):
             # 1. Threat Intelligence Matching
             if self.threat_intel_service:
                 raw_data = event_dict.get("raw_data", {})
-                threat_intel_enrichments = await self.threat_intel_service.enrich_with_threat_intel(raw_data)
-                enrichments.update(threat_intel_enrichments)
+                enrichments.update(await self._threat_intel_cached(raw_data))
 
             # 2. GeoIP Resolution (Placeholder - would use MaxMind GeoLite2)
             # if "source_ip" in event_dict.get("raw_data", {}):
@@ -67,3 +75,29 @@ class EnrichmentService(BaseService):
             logger.error(f"Error enriching event: {e}", exc_info=True)
 
         return enrichments
+
+    async def _threat_intel_cached(self, raw_data: Dict) -> Dict:
+        """
+        Threat intel enrichment memoized on the event's IOC fields.
+        The same IOCs recur across many events, so most lookups skip the Redis round-trips.
+        """
+        if not isinstance(raw_data, dict):
+            return await self.threat_intel_service.enrich_with_threat_intel(raw_data)
+        key = tuple(raw_data.get(field) for field in _IOC_FIELDS)
+        try:
+            hash(key)
+        except TypeError:
+            return await self.threat_intel_service.enrich_with_threat_intel(raw_data)
+
+        now = time.monotonic()
+        cached = self._ti_cache.get(key)
+        if cached is not None and cached[0] > now:
+            self._ti_cache.move_to_end(key)
+            return cached[1]
+
+        result = await self.threat_intel_service.enrich_with_threat_intel(raw_data)
+        self._ti_cache[key] = (now + _TI_CACHE_TTL, result)
+        self._ti_cache.move_to_end(key)
+        if len(self._ti_cache) > _TI_CACHE_SIZE:
+            self._ti_cache.popitem(last=False)
+        return result
@@ -1,11 +1,35 @@
 import asyncio
 import hashlib
-import json
 import logging
-from datetime import datetime
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import orjson
+from asyncpg.exceptions import UniqueViolationError
+
+# Dedup keys only need to be collision-resistant, not cryptographic: prefer
+# xxHash3-128, then SIMD BLAKE3, then SHA-256. All expose update()/hexdigest().
+try:
+    from xxhash import xxh3_128 as _dedup_hash
+except ImportError:
+    try:
+        from blake3 import blake3 as _dedup_hash
+    except ImportError:
+        _dedup_hash = hashlib.sha256
+
+try:
+    # C ISO-8601 parser; accepts a trailing "Z" without a str.replace pass
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    def _parse_iso(value: str) -> datetime:
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        return datetime.fromisoformat(value)
 
 from schemas.events_pb2 import Event as ProtoEvent
-from ..database.redis import redis_client
+from ..database.redis import get_redis_client
 from ..database.session import async_session_maker
 from ..messaging.nats_client import nats_client
 from ..models.event import Event as EventModel
@@ -13,6 +37,41 @@ from ..service_manager.base_service import BaseService
 
 logger = logging.getLogger("n7-core.event-pipeline")
 
+# Column order of the buffered event tuples; shared by COPY and the INSERT fallback.
+_EVENT_COPY_COLUMNS = (
+    "event_id", "timestamp", "sentinel_id", "event_class", "severity",
+    "raw_data", "enrichments", "mitre_techniques",
+)
+# Stand-in sentinel_id for events whose sentinel_id is not a valid UUID
+_NIL_UUID = uuid.UUID(int=0)
+_NIL_UUID_STR = str(_NIL_UUID)
+# Batches smaller than this go through a plain INSERT; COPY setup is not worth it.
+_COPY_THRESHOLD = 100
+# Inbound payloads at least this large are dedup-hashed in a worker thread; below it
+# encode+hash is well under a millisecond and the thread hop would cost more.
+_DEDUP_OFFLOAD_BYTES = 256 * 1024
+# Dedup keys this process claimed in Redis, remembered locally until their Redis TTL ends
+_LOCAL_DEDUP_SIZE = 100_000
+_STATS_INTERVAL = 60  # seconds between ingestion throughput summaries
+# Buffered events beyond which handle_event flushes inline (backpressure), in batches
+_MAX_BUFFER_BATCHES = 10
+_EVENT_INSERT_SQL = (
+    f"INSERT INTO {EventModel.__tablename__} ({', '.join(_EVENT_COPY_COLUMNS)}) "
+    f"VALUES ({', '.join(f'${i}' for i in range(1, len(_EVENT_COPY_COLUMNS) + 1))}) "
+    "ON CONFLICT DO NOTHING"
+)
+
+
+def _dedup_digest(event_dict: dict) -> str:
+    """
+    Content hash for deduplication over (sentinel_id, event_class, raw_data):
+    one C-level encode straight to bytes, no f-string or str.encode() intermediates.
+    """
+    return _dedup_hash(orjson.dumps(
+        (event_dict.get('sentinel_id'), event_dict.get('event_class'), event_dict.get('raw_data')),
+        option=orjson.OPT_SORT_KEYS,
+    )).hexdigest()
+
 
 class EventPipelineService(BaseService):
     """
@@ -24,12 +83,27 @@ class EventPipelineService(BaseService):
         super().__init__("EventPipelineService")
         self._running = False
         self.dedup_window = 60  # seconds
+        # event hash -> monotonic expiry, in claim order (= expiry order: the TTL is fixed)
+        self._local_dedup: OrderedDict[str, float] = OrderedDict()
         self.enrichment_service = None  # Injected via set_enrichment_service()
         self._buffer: list = []
-        self._flush_lock = asyncio.Lock()
         self._flush_task: asyncio.Task | None = None
+        # Wakes _flush_loop early once a full batch is buffered
+        self._flush_kick = asyncio.Event()
+        # Outbound message reused for every forwarded event: filled and serialized
+        # with no await in between, so concurrent callbacks cannot interleave.
+        self._proto_event = ProtoEvent()
+        # Fallback "now" for events without a usable timestamp, rebuilt once per millisecond
+        self._now_ms = 0
+        self._now: tuple[datetime, str] = (datetime.min, "")
+        # Per-event logs are DEBUG (checked once in start()); INFO gets a periodic summary
+        self._debug = False
+        self._events_ingested = 0
+        self._duplicates_dropped = 0
+        self._string_raw_data = 0
+        self._stats_task: asyncio.Task | None = None
         self.FLUSH_INTERVAL = 1.0    # seconds
-        self.FLUSH_BATCH_SIZE = 500  # items
+        self.FLUSH_BATCH_SIZE = 5000  # items
 
     def set_enrichment_service(self, enrichment_service):
         """Inject EnrichmentService (which in turn holds ThreatIntelService)."""
@@ -37,6 +111,7 @@ class EventPipelineService(BaseService):
 
     async def start(self):
         self._running = True
+        self._debug = logger.isEnabledFor(logging.DEBUG)
         logger.info("EventPipelineService started.")
 
         # Subscribe to Sentinel events via JetStream
@@ -54,9 +129,12 @@ class EventPipelineService(BaseService):
             logger.warning("NATS/JetStream not connected, EventPipelineService waiting for connection...")
 
         self._flush_task = asyncio.create_task(self._flush_loop())
+        self._stats_task = asyncio.create_task(self._log_stats())
 
     async def stop(self):
         self._running = False
+        if self._stats_task:
+            self._stats_task.cancel()
         if self._flush_task:
             self._flush_task.cancel()
             try:
@@ -66,41 +144,111 @@ class EventPipelineService(BaseService):
         await self._flush_buffer()  # drain remaining events
         logger.info("EventPipelineService stopped.")
 
+    async def _log_stats(self):
+        """Summarise ingestion throughput at INFO in place of per-event log lines."""
+        while self._running:
+            await asyncio.sleep(_STATS_INTERVAL)
+            if self._events_ingested or self._duplicates_dropped:
+                logger.info(
+                    f"Ingested {self._events_ingested} events, dropped {self._duplicates_dropped} "
+                    f"duplicates in the last {_STATS_INTERVAL}s"
+                )
+                self._events_ingested = 0
+                self._duplicates_dropped = 0
+            if self._string_raw_data:
+                logger.warning(
+                    f"{self._string_raw_data} JSON events carried raw_data as a string instead "
+                    f"of an object in the last {_STATS_INTERVAL}s; check the emitting sentinel"
+                )
+                self._string_raw_data = 0
+
     async def _flush_loop(self):
+        """Single flusher: runs every FLUSH_INTERVAL, or as soon as handle_event kicks it."""
         while self._running:
-            await asyncio.sleep(self.FLUSH_INTERVAL)
-            await self._flush_buffer()
+            try:
+                await asyncio.wait_for(self._flush_kick.wait(), timeout=self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_kick.clear()
+            try:
+                await self._flush_buffer()
+            except Exception as e:
+                logger.error(f"Error flushing event batch: {e}", exc_info=True)
 
     async def _flush_buffer(self):
-        async with self._flush_lock:
-            if not self._buffer:
-                return
-            batch = self._buffer[:]
-            self._buffer.clear()
+        if not self._buffer:
+            return
+        # Take the whole list and start a fresh one: O(1), and with no await between
+        # the check and the swap no append can slip in, so no lock is needed.
+        batch, self._buffer = self._buffer, []
         async with async_session_maker() as session:
-            session.add_all(batch)
+            conn = await session.connection()
+            raw_conn = await conn.get_raw_connection()
+            if len(batch) >= _COPY_THRESHOLD:
+                try:
+                    await raw_conn.driver_connection.copy_records_to_table(
+                        EventModel.__tablename__, records=batch, columns=_EVENT_COPY_COLUMNS
+                    )
+                except UniqueViolationError:
+                    # COPY has no conflict handling, so one already-stored event_id
+                    # (JetStream redelivery, dedup failing open) aborts the whole batch.
+                    # Redo it through the INSERT path, which skips conflicting rows.
+                    logger.warning(f"Duplicate event_id in a {len(batch)}-event COPY batch, re-inserting it row-wise")
+                    await session.rollback()
+                    conn = await session.connection()
+                    raw_conn = await conn.get_raw_connection()
+                    await raw_conn.driver_connection.executemany(_EVENT_INSERT_SQL, batch)
+            else:
+                await raw_conn.driver_connection.executemany(_EVENT_INSERT_SQL, batch)
             await session.commit()
-        logger.debug(f"Flushed {len(batch)} events to DB.")
+        if nats_client.nc and nats_client.nc.is_connected:
+            try:
+                await nats_client.nc.flush(timeout=1)
+            except Exception as e:
+                logger.warning(f"NATS flush after event batch failed: {e}")
+        if self._debug:
+            logger.debug(f"Flushed {len(batch)} events to DB.")
 
-    async def _is_duplicate(self, event_dict: dict) -> bool:
+    def _utc_now(self) -> tuple[datetime, str]:
+        """Naive UTC now and its ISO-8601 form, cached at millisecond granularity."""
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms != self._now_ms:
+            now = datetime.fromtimestamp(now_ms / 1000, timezone.utc).replace(tzinfo=None)
+            self._now_ms = now_ms
+            self._now = (now, now.isoformat())
+        return self._now
+
+    async def _is_duplicate(self, event_dict: dict, size_hint: int = 0) -> bool:
         """
         Check if event is a duplicate using Redis.
         Key: sentinel_type:event_class:hash(raw_data)
+        size_hint is the inbound payload size; very large events are hashed off the loop.
         """
         try:
-            # Create a deterministic hash of the event content
             # Avoiding timestamp in hash as duplicate events might have slightly different timestamps
-            # Use raw_data and sentinel_id
-            unique_str = f"{event_dict.get('sentinel_id')}:{event_dict.get('event_class')}:{json.dumps(event_dict.get('raw_data'), sort_keys=True)}"
-            event_hash = hashlib.sha256(unique_str.encode()).hexdigest()
+            if size_hint >= _DEDUP_OFFLOAD_BYTES:
+                event_hash = await asyncio.to_thread(_dedup_digest, event_dict)
+            else:
+                event_hash = _dedup_digest(event_dict)
+            # A key this process claimed is still live in Redis until its TTL runs
+            # out, so a local hit is a certain duplicate and needs no round-trip.
+            now = time.monotonic()
+            local = self._local_dedup
+            expires = local.get(event_hash)
+            if expires is not None and expires > now:
+                return True
+
             key = f"n7:dedup:{event_hash}"
 
-            # Check if key exists
-            if await redis_client.get(key):
+            # SET NX is an atomic check-and-claim: None means the key already existed
+            claimed = await get_redis_client().set(key, "1", ex=self.dedup_window, nx=True)
+            if claimed is None:
                 return True
-
-            # Set key with expiry
-            await redis_client.set(key, "1", ex=self.dedup_window)
+            # Only our own claims are cached: their expiry is known exactly
+            local[event_hash] = now + self.dedup_window
+            local.move_to_end(event_hash)
+            while local and (len(local) > _LOCAL_DEDUP_SIZE or next(iter(local.values())) <= now):
+                local.popitem(last=False)
             return False
         except Exception as e:
             logger.error(f"Redis error in deduplication: {e}")
@@ -108,44 +256,74 @@ class EventPipelineService(BaseService):
 
     async def handle_event(self, msg):
         """
-        Callback for incoming NATS messages (JSON from EventEmitterService).
+        Callback for incoming NATS messages (JSON from EventEmitterService,
+        or a serialized Event protobuf).
         """
         try:
-            # Parse JSON payload sent by EventEmitterService
-            event_dict = json.loads(msg.data.decode())
+            # orjson parses the bytes payload directly (no decode-to-str pass)
+            inbound_proto = None
+            try:
+                event_dict = orjson.loads(msg.data)
+            except orjson.JSONDecodeError:
+                inbound_proto = msg.data
+                proto = ProtoEvent.FromString(msg.data)
+                event_dict = {
+                    "event_id": proto.event_id,
+                    "timestamp": proto.timestamp,
+                    "sentinel_id": proto.sentinel_id,
+                    "event_class": proto.event_class,
+                    "severity": proto.severity,
+                    "raw_data": proto.raw_data,
+                }
 
-            import uuid as _uuid
-            event_id = event_dict.get("event_id") or str(_uuid.uuid4())
-            # Ensure event_id is a valid UUID string; generate one if malformed
+            # 1. Deduplication — before any normalisation, so noisy duplicates cost
+            # only the parse and one Redis call
+            if await self._is_duplicate(event_dict, len(msg.data)):
+                self._duplicates_dropped += 1
+                if self._debug:
+                    logger.debug(f"Duplicate event dropped: {event_dict.get('event_id')}")
+                return
+
+            get = event_dict.get  # bound once; read for every field below
+
+            # Ids are parsed exactly once; the UUID objects go straight into the
+            # COPY record. A missing or malformed event_id gets a fresh one.
+            event_id = get("event_id")
             try:
-                _uuid.UUID(str(event_id))
-            except (ValueError, AttributeError):
-                event_id = str(_uuid.uuid4())
+                event_uuid = uuid.UUID(event_id)
+            except (ValueError, TypeError, AttributeError):
+                event_uuid = uuid.uuid4()
+                event_id = str(event_uuid)
 
             # sentinel_id must be a valid UUID for the DB column; fall back to a
             # deterministic nil-UUID so rows still persist rather than crashing.
-            _raw_sentinel_id = event_dict.get("sentinel_id", "")
             try:
-                sentinel_id = str(_uuid.UUID(str(_raw_sentinel_id)))
-            except (ValueError, AttributeError):
-                sentinel_id = str(_uuid.UUID(int=0))  # 00000000-0000-0000-0000-000000000000
-
-            event_class = event_dict.get("event_class", "unknown")
-            severity = event_dict.get("severity", "informational")
-            raw_data = event_dict.get("raw_data", {})
-            if isinstance(raw_data, str):
+                sentinel_uuid = uuid.UUID(get("sentinel_id"))
+                sentinel_id = str(sentinel_uuid)
+            except (ValueError, TypeError, AttributeError):
+                sentinel_uuid = _NIL_UUID
+                sentinel_id = _NIL_UUID_STR
+
+            event_class = get("event_class", "unknown")
+            severity = get("severity", "informational")
+            raw_data = get("raw_data", {})
+            raw_data_changed = False
+            # Contract: JSON producers send raw_data as an object. A string is expected
+            # only inside protobuf events; from a JSON producer it is counted so the
+            # emitter can be fixed instead of every consumer re-parsing.
+            if type(raw_data) is str:
+                if inbound_proto is None:
+                    self._string_raw_data += 1
                 try:
-                    raw_data = json.loads(raw_data)
-                except Exception:
+                    raw_data = orjson.loads(raw_data)
+                except orjson.JSONDecodeError:
                     raw_data = {"raw": raw_data}
-            timestamp_str = event_dict.get("timestamp")
+                    raw_data_changed = True
+            timestamp_str = get("timestamp")
 
-            # 1. Deduplication
-            if await self._is_duplicate(event_dict):
-                logger.debug(f"Duplicate event dropped: {event_id}")
-                return
-
-            logger.info(f"Processing event: {event_id} type={event_class}")
+            self._events_ingested += 1
+            if self._debug:
+                logger.debug(f"Processing event: {event_id} type={event_class}")
 
             # 2. Enrichment — IOC cross-reference via ThreatIntelService
             enrichments = {}
@@ -161,41 +339,65 @@ class EventPipelineService(BaseService):
                 severity = "critical"
                 raw_data["ioc_matched"] = True
                 raw_data["ioc_matches"] = enrichments["threat_intel_matches"]
+                raw_data_changed = True
 
             # 3. Persistence — push to buffer for batch flush
-            ts = datetime.utcnow()
+            ts = ts_iso = None
             if timestamp_str:
                 try:
-                    ts = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+                    ts = _parse_iso(timestamp_str)
+                    if ts.tzinfo is not None:
+                        ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
                 except Exception:
-                    pass
-
-            db_event = EventModel(
-                event_id=event_id,
-                timestamp=ts,
-                sentinel_id=sentinel_id,
-                event_class=event_class,
-                severity=severity,
-                raw_data=raw_data,
-                enrichments=enrichments,
-                mitre_techniques=event_dict.get("mitre_techniques", [])
-            )
-            self._buffer.append(db_event)
+                    ts = None
+            if ts is None:
+                ts, ts_iso = self._utc_now()
+
+            # Buffered as a COPY-ready record: JSON columns are serialized here
+            # so the flush only ships text to the server.
+            dumps = orjson.dumps
+            raw_data_json = dumps(raw_data).decode()
+            enrichments_json = dumps(enrichments).decode()
+            self._buffer.append((
+                event_uuid,
+                ts,
+                sentinel_uuid,
+                event_class,
+                severity,
+                raw_data_json,
+                enrichments_json,
+                dumps(get("mitre_techniques", [])).decode(),
+            ))
             if len(self._buffer) >= self.FLUSH_BATCH_SIZE:
-                asyncio.create_task(self._flush_buffer())
+                self._flush_kick.set()
+                if len(self._buffer) >= self.FLUSH_BATCH_SIZE * _MAX_BUFFER_BATCHES:
+                    # The flusher is falling behind: write from here so the buffer
+                    # cannot grow without bound and ingestion slows to DB speed.
+                    await self._flush_buffer()
 
             # 4. Forward to Threat Correlation (via NATS subject) as Protobuf
-            if nats_client.nc and nats_client.nc.is_connected:
-                proto_event = ProtoEvent(
-                    event_id=event_id,
-                    timestamp=ts.isoformat(),
-                    sentinel_id=sentinel_id,
-                    event_class=event_class,
-                    severity=severity,
-                    raw_data=json.dumps(raw_data),
-                    enrichments=json.dumps(enrichments),
-                )
-                await nats_client.nc.publish("n7.internal.events", proto_event.SerializeToString())
+            nc = nats_client.nc
+            if nc and nc.is_connected:
+                proto_event = self._proto_event
+                proto_event.Clear()
+                proto_event.event_id = event_id
+                proto_event.timestamp = ts_iso or ts.isoformat()
+                proto_event.sentinel_id = sentinel_id
+                proto_event.event_class = event_class or ""
+                proto_event.severity = severity or ""
+                proto_event.enrichments = enrichments_json
+                if inbound_proto is not None and not raw_data_changed:
+                    # Protobuf in, raw_data untouched: pass the sentinel's bytes through
+                    # and append only the updated fields. For a singular scalar field that
+                    # appears twice, parsers keep the last value, so the appended ones
+                    # override the originals (repeated or message fields would be
+                    # appended to or merged instead, not overwritten).
+                    payload = inbound_proto + proto_event.SerializeToString()
+                else:
+                    proto_event.raw_data = raw_data_json
+                    payload = proto_event.SerializeToString()
+                # Only appends to the client's pending buffer; _flush_buffer pushes the batch out
+                await nc.publish("n7.internal.events", payload)
 
         except Exception as e:
             logger.error(f"Error processing event: {e}", exc_info=True)
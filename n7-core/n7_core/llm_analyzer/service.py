@@ -6,8 +6,8 @@ from typing import Optional
 
 import httpx
 
-from ..config import settings
-from ..database.redis import redis_client
+from ..config import get_settings
+from ..database.redis import get_redis_client
 from ..database.session import async_session_maker
 from ..messaging.nats_client import nats_client
 from ..models.alert import Alert as AlertModel
@@ -57,6 +57,7 @@ class LLMAnalyzerService(BaseService):
         super().__init__("LLMAnalyzerService")
         self._running = False
         self._http_client: Optional[httpx.AsyncClient] = None
+        settings = get_settings()
         self._ollama_url: str = settings.OLLAMA_URL
         self._ollama_model: str = settings.OLLAMA_MODEL
         self._cache_ttl: int = 3600  # Redis cache for LLM results
@@ -166,13 +167,13 @@ class LLMAnalyzerService(BaseService):
 
             # Check Redis cache first (idempotent re-analysis prevention)
             cache_key = f"n7:llm:narrative:{alert_id}"
-            cached_raw = await redis_client.get(cache_key)
+            cached_raw = await get_redis_client().get(cache_key)
             if cached_raw:
                 narrative_data = json.loads(cached_raw)
                 logger.debug(f"LLM cache hit for alert {alert_id}")
             else:
                 narrative_data = await self._generate_narrative(reasoning, event_summaries)
-                await redis_client.set(cache_key, json.dumps(narrative_data), ex=self._cache_ttl)
+                await get_redis_client().set(cache_key, json.dumps(narrative_data), ex=self._cache_ttl)
 
             llm_narrative: str = narrative_data.get("narrative", "")
             llm_mitre_tactic: str = narrative_data.get("mitre_tactic", "")
@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 
 from pythonjsonlogger import jsonlogger
 
-from .config import settings
+from .config import get_settings
 
 # ANSI escape codes
 _RESET    = "\033[0m"
@@ -70,6 +70,7 @@ def setup_logging() -> logging.Logger:
 
     Log level is controlled by settings.LOG_LEVEL (default: INFO).
     """
+    settings = get_settings()
     root = logging.getLogger()
 
     # Remove handlers added by imported libraries before us
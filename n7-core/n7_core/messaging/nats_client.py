@@ -6,7 +6,7 @@ from typing import Optional
 from nats.aio.client import Client as NATS
 from nats.js import JetStreamContext
 
-from ..config import settings
+from ..config import get_settings
 
 logger = logging.getLogger("n7-core.messaging")
 
@@ -48,6 +48,7 @@ class NATSClient:
         from nats.js.errors import NotFoundError
         from nats.js.api import StreamConfig
 
+        settings = get_settings()
         tls_ctx = _build_tls_context()
 
         try:
@@ -1,12 +1,12 @@
-from datetime import datetime, UTC
+from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import DateTime, Integer, String, JSON
+from sqlalchemy import DateTime, Index, Integer, String, JSON
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column
 
-from ..database.base import Base, UUIDMixin
+from ..database.base import Base, UUIDMixin, utc_now
 
 
 class AgentConfig(Base, UUIDMixin):
@@ -23,8 +23,21 @@ class AgentConfig(Base, UUIDMixin):
     Ref: TDD Section 5.x Agent Configuration Management
     """
     __tablename__ = "agent_configs"
+    __table_args__ = (
+        # Unique lookup key for every config read/write; INCLUDEs the hot scalar
+        # columns so the poll path can be answered by an index-only scan.
+        Index(
+            "ix_agent_configs_agent_id_cover",
+            "agent_id",
+            unique=True,
+            postgresql_include=[
+                "nats_url_enc", "core_api_url_enc", "config_version",
+                "log_level", "environment", "zone",
+            ],
+        ),
+    )
 
-    agent_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False, unique=True, index=True)
+    agent_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False)
 
     # --- Connectivity (stored Fernet-encrypted) ---
     nats_url_enc: Mapped[Optional[str]] = mapped_column(String, nullable=True)
@@ -57,8 +70,8 @@ class AgentConfig(Base, UUIDMixin):
     config_version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(UTC),
-        onupdate=lambda: datetime.now(UTC),
+        server_default=utc_now(),
+        onupdate=utc_now(),
         nullable=False,
     )
 
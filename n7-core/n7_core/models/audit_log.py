@@ -2,7 +2,7 @@ import hashlib
 import uuid
 from datetime import datetime
 
-from sqlalchemy import String, JSON, DateTime
+from sqlalchemy import BigInteger, String, JSON, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -15,9 +15,15 @@ class AuditLog(Base):
     Ref: SRS FR-C040, FR-C041, FR-C042
     """
     __tablename__ = "audit_log"
+    __table_args__ = (
+        # One successor per entry: a second writer chaining from the same head (or a
+        # second genesis entry, previous_hash NULL) fails instead of forking the chain.
+        Index("uq_audit_log_previous_hash", text("coalesce(previous_hash, '')"), unique=True),
+    )
 
     log_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     timestamp: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    timestamp_ns: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)  # epoch ns, hashed + chain order
     actor: Mapped[str] = mapped_column(String, nullable=False)  # username or agent_id
     action: Mapped[str] = mapped_column(String, nullable=False,
                                         index=True)  # event type (e.g., "event_created", "alert_generated")
@@ -7,7 +7,7 @@ from typing import Dict
 
 import httpx
 
-from ..config import settings
+from ..config import get_settings
 from ..messaging.nats_client import nats_client
 from ..service_manager.base_service import BaseService
 
@@ -80,7 +80,7 @@ class NotifierService(BaseService):
     async def send_slack(self, notification: Dict):
         """Send notification to Slack via webhook."""
         try:
-            slack_url = getattr(settings, 'SLACK_WEBHOOK_URL', None)
+            slack_url = getattr(get_settings(), 'SLACK_WEBHOOK_URL', None)
             if not slack_url:
                 logger.warning("SLACK_WEBHOOK_URL not configured, skipping Slack notification")
                 return
@@ -120,6 +120,7 @@ class NotifierService(BaseService):
     async def send_email(self, notification: Dict):
         """Send notification via email (SMTP)."""
         try:
+            settings = get_settings()
             smtp_host = getattr(settings, 'SMTP_HOST', None)
             smtp_port = getattr(settings, 'SMTP_PORT', 587)
             smtp_user = getattr(settings, 'SMTP_USER', None)
@@ -164,7 +165,7 @@ Details:
     async def send_webhook(self, notification: Dict):
         """Send notification to generic webhook."""
         try:
-            webhook_url = notification.get("webhook_url") or getattr(settings, 'WEBHOOK_URL', None)
+            webhook_url = notification.get("webhook_url") or getattr(get_settings(), 'WEBHOOK_URL', None)
             if not webhook_url:
                 logger.warning("Webhook URL not provided, skipping webhook notification")
                 return
@@ -189,7 +190,7 @@ Details:
     async def send_pagerduty(self, notification: Dict):
         """Send notification to PagerDuty Events API v2."""
         try:
-            pd_integration_key = getattr(settings, 'PAGERDUTY_INTEGRATION_KEY', None)
+            pd_integration_key = getattr(get_settings(), 'PAGERDUTY_INTEGRATION_KEY', None)
             if not pd_integration_key:
                 logger.warning("PAGERDUTY_INTEGRATION_KEY not configured, skipping PagerDuty notification")
                 return
@@ -1,16 +1,17 @@
-import json
 import logging
 import re
 import uuid
 from datetime import datetime, timedelta
 from typing import Dict, List
 
+import orjson
+
 # Protobuf schemas generated successfully
 from schemas.alerts_pb2 import Alert as ProtoAlert
 from schemas.events_pb2 import Event as ProtoEvent
 # Import correlation rules
 from .correlation_rules import CORRELATION_RULES
-from ..database.redis import redis_client
+from ..database.redis import get_redis_client
 from ..database.session import async_session_maker
 from ..messaging.nats_client import nats_client
 from ..models.alert import Alert as AlertModel
@@ -66,10 +67,8 @@ class ThreatCorrelatorService(BaseService):
             proto_event.ParseFromString(msg.data)
 
             # Parse raw_data
-            raw_data = json.loads(proto_event.raw_data) if isinstance(proto_event.raw_data,
-                                                                      str) else proto_event.raw_data
-            if isinstance(raw_data, bytes):
-                raw_data = json.loads(raw_data.decode())
+            raw_data = orjson.loads(proto_event.raw_data) if isinstance(proto_event.raw_data,
+                                                                        (str, bytes)) else proto_event.raw_data
 
             event_class = proto_event.event_class
             source_ip = raw_data.get("source_ip", "unknown")
@@ -126,10 +125,10 @@ class ThreatCorrelatorService(BaseService):
         source_ip = raw_data.get("source_ip", "unknown")
         key = f"n7:corr:{rule_id}:{source_ip}"
 
-        count = await redis_client.incr(key)
+        count = await get_redis_client().incr(key)
 
         if count == 1:
-            await redis_client.expire(key, time_window)
+            await get_redis_client().expire(key, time_window)
 
         if count >= threshold:
             logger.warning(f"Rule '{rule['name']}' triggered for {source_ip} (count={count})")
@@ -141,7 +140,7 @@ class ThreatCorrelatorService(BaseService):
                 count=count
             )
             # Reset counter after alert
-            await redis_client.delete(key)
+            await get_redis_client().delete(key)
 
     async def _check_multi_stage_pattern(self, rule_id: str, rule: Dict, source_identifier: str):
         """Check multi-stage attack patterns"""
@@ -271,7 +270,7 @@ class ThreatCorrelatorService(BaseService):
         # but only send to the LLM when the cooldown key is absent.  This prevents
         # flooding the LLM with the same recurring condition (e.g. CPU always high).
         cooldown_key = f"n7:alert_cooldown:{rule_id}:{source_identifier}"
-        in_cooldown = await redis_client.get(cooldown_key)
+        in_cooldown = await get_redis_client().get(cooldown_key)
 
         alert_id = str(uuid.uuid4())
         severity = rule.get("severity", "medium")
@@ -298,7 +297,7 @@ class ThreatCorrelatorService(BaseService):
             severity=severity,
             status="new",
             verdict="pending",
-            reasoning=json.dumps(reasoning),
+            reasoning=orjson.dumps(reasoning).decode(),
             affected_assets=[source_identifier]
         )
 
@@ -306,7 +305,6 @@ class ThreatCorrelatorService(BaseService):
         async with async_session_maker() as session:
             db_alert = AlertModel(
                 alert_id=uuid.UUID(alert_id),
-                created_at=datetime.utcnow(),
                 event_ids=event_ids,
                 threat_score=threat_score,
                 severity=severity,
@@ -330,7 +328,7 @@ class ThreatCorrelatorService(BaseService):
             return
 
         # Set cooldown BEFORE publishing so parallel firings don't race through
-        await redis_client.set(cooldown_key, "1", ex=self.ALERT_COOLDOWN)
+        await get_redis_client().set(cooldown_key, "1", ex=self.ALERT_COOLDOWN)
 
         llm_bundle = {
             "alert_id": alert_id,
@@ -342,7 +340,7 @@ class ThreatCorrelatorService(BaseService):
             "event_summaries": self._build_event_summaries(source_identifier, event_ids),
         }
         if nats_client.nc and nats_client.nc.is_connected:
-            await nats_client.nc.publish("n7.llm.analyze", json.dumps(llm_bundle).encode())
+            await nats_client.nc.publish("n7.llm.analyze", orjson.dumps(llm_bundle))
             logger.info(f"Sent alert bundle {alert_id} to n7.llm.analyze for rule '{rule['name']}'")
 
     def _build_event_summaries(self, source_identifier: str, event_ids: List[str]) -> List[Dict]:
@@ -1,9 +1,10 @@
-import json
 import logging
 from datetime import datetime
 from typing import Optional, Dict
 
-from ..database.redis import redis_client
+import orjson
+
+from ..database.redis import get_redis_client
 from ..service_manager.base_service import BaseService
 
 logger = logging.getLogger("n7-core.threat-intel")
@@ -45,11 +46,11 @@ class ThreatIntelService(BaseService):
         """
         try:
             key = f"n7:ioc:{ioc_type}:{ioc_value}"
-            cached = await redis_client.get(key)
+            cached = await get_redis_client().get(key)
 
             if cached:
                 logger.debug(f"IOC cache hit: {ioc_type}={ioc_value}")
-                return json.loads(cached)
+                return orjson.loads(cached)
 
             # Future: Query database for IOCs if not in cache
             # For now, return None (not found)
@@ -92,7 +93,7 @@ class ThreatIntelService(BaseService):
 
             key = f"n7:ioc:{ioc_type}:{ioc_value}"
             effective_ttl = ttl if ttl is not None else self.ioc_cache_ttl
-            await redis_client.set(key, json.dumps(ioc_data), ex=effective_ttl)
+            await get_redis_client().set(key, orjson.dumps(ioc_data), ex=effective_ttl)
 
             logger.info(f"Added IOC: {ioc_type}={ioc_value} from {source} (TTL={effective_ttl}s)")
 
@@ -124,10 +125,16 @@ class ThreatIntelService(BaseService):
             if "url" in event_data:
                 checks.append(("url", event_data["url"]))
 
-            for ioc_type, ioc_value in checks:
-                match = await self.check_ioc(ioc_type, ioc_value)
-                if match:
-                    enrichments["threat_intel_matches"].append(match)
+            if not checks:
+                return enrichments
+
+            # All of the event's IOC fields in one MGET round-trip rather than a GET each
+            cached = await get_redis_client().mget(
+                [f"n7:ioc:{ioc_type}:{ioc_value}" for ioc_type, ioc_value in checks]
+            )
+            for (ioc_type, ioc_value), raw in zip(checks, cached):
+                if raw:
+                    enrichments["threat_intel_matches"].append(orjson.loads(raw))
                     logger.info(f"Threat intel match: {ioc_type}={ioc_value}")
 
         except Exception as e:
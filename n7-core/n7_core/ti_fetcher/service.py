@@ -8,7 +8,7 @@ import httpx
 
 from ..service_manager.base_service import BaseService
 from ..threat_intel.service import ThreatIntelService
-from ..config import settings
+from ..config import get_settings
 
 logger = logging.getLogger("n7-core.ti-fetcher")
 
@@ -55,7 +55,7 @@ class TIFetcherService(BaseService):
         self._running = False
         self._threat_intel = threat_intel_service
         self._http_client: Optional[httpx.AsyncClient] = None
-        self._fetch_interval: int = settings.TI_FETCH_INTERVAL
+        self._fetch_interval: int = get_settings().TI_FETCH_INTERVAL
         self._fetch_task: Optional[asyncio.Task] = None
 
     async def start(self):
@@ -108,7 +108,7 @@ class TIFetcherService(BaseService):
         """Download a single feed and dispatch to the appropriate parser."""
         headers = {}
         if feed.get("requires_auth"):
-            api_key = getattr(settings, feed["auth_env"], "")
+            api_key = getattr(get_settings(), feed["auth_env"], "")
             if not api_key:
                 logger.warning(
                     f"Feed '{feed['name']}' requires auth but {feed['auth_env']} env var not set. Skipping."
@@ -161,7 +161,7 @@ class TIFetcherService(BaseService):
                     confidence=0.85,
                     source=f"feed:otx:{pulse_name}",
                     metadata={"pulse_id": pulse_id, "raw_type": raw_type},
-                    ttl=settings.TI_IOC_TTL,
+                    ttl=get_settings().TI_IOC_TTL,
                 )
                 count += 1
         return count
@@ -187,7 +187,7 @@ class TIFetcherService(BaseService):
                     confidence=0.90,
                     source="feed:urlhaus",
                     metadata={"threat_type": threat_type, "tags": tags, "date_added": date_added},
-                    ttl=settings.TI_IOC_TTL,
+                    ttl=get_settings().TI_IOC_TTL,
                 )
                 count += 1
 
@@ -201,7 +201,7 @@ class TIFetcherService(BaseService):
                     confidence=0.80,
                     source="feed:urlhaus",
                     metadata={"threat_type": threat_type},
-                    ttl=settings.TI_IOC_TTL,
+                    ttl=get_settings().TI_IOC_TTL,
                 )
                 count += 1
         return count
@@ -228,7 +228,7 @@ class TIFetcherService(BaseService):
                     "first_seen": entry.get("first_seen", ""),
                     "last_online": entry.get("last_online", ""),
                 },
-                ttl=settings.TI_IOC_TTL,
+                ttl=get_settings().TI_IOC_TTL,
             )
             count += 1
         return count
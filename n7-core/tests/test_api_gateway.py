@@ -0,0 +1,35 @@
+import warnings
+
+from n7_core.api_gateway.service import app
+
+
+def test_routes_registered_once():
+    # Including a router twice shows up as duplicate operation IDs in the schema
+    # (and doubles the route table the matcher scans on every request).
+    app.openapi_schema = None
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        schema = app.openapi()
+
+    duplicates = [w for w in caught if "Duplicate Operation ID" in str(w.message)]
+    assert not duplicates, [str(w.message) for w in duplicates]
+    assert "/health" in schema["paths"]
+
+
+def test_importing_services_does_not_build_settings():
+    import os
+    import subprocess
+    import sys
+
+    # Required settings (SECRET_KEY, DATABASE_URL, ...) deliberately absent
+    env = {key: value for key, value in os.environ.items() if key in ("PATH", "PYTHONPATH", "HOME")}
+    code = (
+        "import main\n"
+        "from n7_core.config import get_settings\n"
+        "from n7_core.database.session import get_engine\n"
+        "assert get_settings.cache_info().currsize == 0\n"
+        "assert get_engine.cache_info().currsize == 0\n"
+    )
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,144 @@
+import time
+import uuid
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+
+from n7_core.audit_logger import service as audit
+from n7_core.audit_logger.service import AuditLoggerService
+from n7_core.models.audit_log import AuditLog
+
+
+class FakeAuditDB:
+    """audit_log rows kept in memory; serves COPY writes and the verify SELECT."""
+
+    def __init__(self):
+        self.rows = []
+
+    def session(self):
+        db = self
+
+        class Result:
+            def __init__(self, rows):
+                self._rows = rows
+
+            def scalars(self):
+                return self
+
+            def all(self):
+                return self._rows
+
+        class RawConn:
+            async def copy_records_to_table(self, table, records, columns):
+                assert table == AuditLog.__tablename__
+                for record in records:
+                    row = dict(zip(columns, record))
+                    # details goes over COPY as JSON text; the JSON column reads back a dict
+                    row["details"] = orjson.loads(row["details"])
+                    db.rows.append(AuditLog(**row))
+
+        class Conn:
+            async def get_raw_connection(self):
+                return type("PoolProxiedConnection", (), {"driver_connection": RawConn()})()
+
+        class Session:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def execute(self, stmt):
+                return Result(sorted(db.rows, key=lambda row: row.timestamp_ns))
+
+            async def connection(self):
+                return Conn()
+
+            async def commit(self):
+                pass
+
+        return Session()
+
+
+@pytest.mark.asyncio
+async def test_backfilled_bulk_ingest_keeps_chain_verifiable(monkeypatch):
+    db = FakeAuditDB()
+    monkeypatch.setattr(audit, "async_session_maker", db.session)
+
+    # Existing head written just now
+    head_ts = time.time_ns()
+    head = AuditLog(
+        log_id=uuid.uuid4(), timestamp_ns=head_ts, actor="system", action="startup",
+        resource=None, details={}, previous_hash=None,
+    )
+    head.current_hash = AuditLog.calculate_hash(
+        log_id=str(head.log_id), timestamp=str(head_ts), actor="system", action="startup",
+        resource="", details="{}", previous_hash="",
+    )
+    db.rows.append(head)
+
+    service = AuditLoggerService()
+    service._set_head((head.current_hash, head_ts))
+    service._last_hash_loaded = True
+
+    # Historical backfill, older than the head and out of order within the batch
+    hour_ago = head_ts - 3_600_000_000_000
+    entries = [
+        {"actor": "admin", "action": "login", "timestamp_ns": hour_ago + 5},
+        {"actor": "admin", "action": "logout", "timestamp_ns": hour_ago},
+        {"actor": "admin", "action": "login", "details": {"ip": "10.0.0.5"}},
+    ]
+    assert await service.bulk_ingest(entries) == 3
+
+    timestamps = [row.timestamp_ns for row in db.rows]
+    assert timestamps == sorted(set(timestamps))
+    assert service._last_ts_ns == timestamps[-1]
+    assert await service.verify_hash_chain() is True
+
+
+@pytest.mark.asyncio
+async def test_lost_append_race_rereads_head_and_rechains(monkeypatch):
+    from sqlalchemy.exc import IntegrityError
+
+    # Head in the DB after another process appended past the one we cached
+    peer_head = ("b" * 64, time.time_ns())
+    written = []
+
+    class Result:
+        def first(self):
+            return peer_head
+
+    class Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def execute(self, stmt):
+            assert stmt._for_update_arg is not None
+            return Result()
+
+        def add(self, entry):
+            self.entry = entry
+
+        async def commit(self):
+            if self.entry.previous_hash == "a" * 64:
+                raise IntegrityError("INSERT", {}, Exception("uq_audit_log_previous_hash"))
+            written.append(self.entry)
+
+    monkeypatch.setattr(audit, "async_session_maker", Session)
+    service = AuditLoggerService()
+    service._set_head(("a" * 64, peer_head[1] - 1000))
+    service._last_hash_loaded = True
+
+    await service.log_entry("admin", "login")
+
+    assert len(written) == 1
+    assert written[0].previous_hash == peer_head[0]
+    assert written[0].timestamp_ns > peer_head[1]
+    assert written[0].timestamp == datetime.fromtimestamp(
+        written[0].timestamp_ns / 1e9, timezone.utc
+    ).replace(tzinfo=None)
+    assert service._last_hash == written[0].current_hash
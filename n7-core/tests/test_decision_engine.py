@@ -0,0 +1,203 @@
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from n7_core.decision_engine.policy import _SEVERITY_HANDLERS
+from n7_core.decision_engine.service import DecisionEngineService
+from n7_core.messaging.nats_client import nats_client
+from schemas.alerts_pb2 import Alert
+
+
+def _alert(severity, threat_score=0, reasoning=None):
+    return Alert(
+        alert_id="a-1",
+        severity=severity,
+        threat_score=threat_score,
+        reasoning=json.dumps(reasoning) if reasoning else "",
+    )
+
+
+def test_severity_verdicts():
+    assert _SEVERITY_HANDLERS["medium"](_alert("medium")) == ("escalate", None)
+    assert _SEVERITY_HANDLERS["high"](_alert("high", threat_score=50)) == ("dismiss", None)
+    assert "low" not in _SEVERITY_HANDLERS
+
+    verdict, action = _SEVERITY_HANDLERS["high"](
+        _alert("high", threat_score=90, reasoning={"rule": "Brute Force", "source_ip": "10.0.0.5"})
+    )
+    assert verdict == "auto_respond"
+    assert action == {"action_type": "network_block", "target": "10.0.0.5", "duration": 3600}
+
+
+def test_critical_multi_stage_isolates_host():
+    verdict, action = _SEVERITY_HANDLERS["critical"](
+        _alert("critical", reasoning={"is_multi_stage": True, "source": "host-7", "rule": "Kill Chain"})
+    )
+    assert verdict == "auto_respond"
+    assert action["action_type"] == "isolate_host"
+    assert action["source"] == "host-7"
+    assert _SEVERITY_HANDLERS["critical"](_alert("critical")) == ("escalate", None)
+
+
+@pytest.mark.asyncio
+async def test_queued_alerts_dispatch_actions(monkeypatch):
+    nc = MagicMock()
+    nc.is_connected = True
+    nc.subscribe = AsyncMock()
+    nc.publish = AsyncMock()
+    nc.flush = AsyncMock()
+    monkeypatch.setattr(nats_client, "nc", nc)
+
+    service = DecisionEngineService()
+    await service.start()
+    nc.flush.reset_mock()
+    try:
+        brute_force = _alert("high", threat_score=90, reasoning={"rule": "Brute Force", "source_ip": "10.0.0.5"})
+        await service.handle_alert(MagicMock(data=brute_force.SerializeToString()))
+        await service.handle_alert(MagicMock(data=_alert("low").SerializeToString()))
+        for _ in range(50):
+            if nc.flush.await_count:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await service.stop()
+
+    nc.publish.assert_awaited_once()
+    subject, data = nc.publish.await_args.args
+    assert subject == "n7.actions.broadcast"
+    payload = json.loads(data)
+    assert payload["type"] == "network_block"
+    assert payload["alert_id"] == "a-1"
+
+
+def test_critical_single_stage_skips_reasoning_decode(monkeypatch):
+    import n7_core.decision_engine.policy as policy
+
+    monkeypatch.setattr(policy.orjson, "loads", MagicMock(side_effect=AssertionError("decoded")))
+    alert = _alert("critical", reasoning={"rule": "Port Scan", "source": "h", "is_multi_stage": False})
+    assert _SEVERITY_HANDLERS["critical"](alert) == ("escalate", None)
+
+
+@pytest.mark.asyncio
+async def test_action_status_is_queued_for_write_behind():
+    service = DecisionEngineService()
+    action_id = "5f0c9a52-2f7a-4c55-9d6e-0b7f3f3c1a10"
+    report = {"action_id": action_id, "status": "succeeded", "result_data": {"ok": True}}
+    await service.handle_action_status(MagicMock(data=json.dumps(report).encode()))
+
+    queued = service._status_q.get_nowait()
+    assert str(queued[0]) == action_id
+    assert queued[2:] == ("succeeded", {"ok": True}, {})
+
+
+@pytest.mark.asyncio
+async def test_own_dispatches_are_inserted_without_lookup():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+
+    service = DecisionEngineService()
+    action_id = service._next_action_id()
+    service._unpersisted_actions[action_id] = None
+    await service._persist_statuses(session, [(action_id, "network_block", "completed", {}, {"pre": {}})])
+
+    # No lookup, just the bulk INSERT
+    session.execute.assert_awaited_once()
+    (rows,) = session.execute.await_args.args[1:]
+    assert rows[0]["action_id"] == action_id and rows[0]["status"] == "completed"
+    session.commit.assert_awaited_once()
+    assert action_id not in service._unpersisted_actions
+
+
+@pytest.mark.asyncio
+async def test_own_dispatch_already_persisted_by_peer_is_upserted():
+    from sqlalchemy.dialects import postgresql
+
+    # A peer in the queue group already created the row from an earlier report
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock()
+
+    service = DecisionEngineService()
+    action_id = service._next_action_id()
+    service._unpersisted_actions[action_id] = None
+    await service._persist_statuses(
+        session, [(action_id, "network_block", "succeeded", {"blocked": True}, {})]
+    )
+
+    stmt, rows = session.execute.await_args.args
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (action_id) DO UPDATE" in sql
+    assert "status = excluded.status" in sql
+    assert rows[0]["action_id"] == action_id and rows[0]["status"] == "succeeded"
+    session.commit.assert_awaited_once()
+
+
+def test_service_class_defined_once():
+    import ast
+    import inspect
+
+    import n7_core.decision_engine.service as module
+
+    tree = ast.parse(inspect.getsource(module))
+    names = [node.name for node in tree.body if isinstance(node, ast.ClassDef)]
+    assert names.count("DecisionEngineService") == 1
+
+
+@pytest.mark.asyncio
+async def test_own_dispatch_stays_fresh_until_commit_succeeds():
+    session = MagicMock()
+    session.execute = AsyncMock()
+    session.commit = AsyncMock(side_effect=RuntimeError("connection lost"))
+
+    service = DecisionEngineService()
+    action_id = service._next_action_id()
+    service._unpersisted_actions[action_id] = None
+    with pytest.raises(RuntimeError):
+        await service._persist_statuses(session, [(action_id, "network_block", "completed", {}, {})])
+
+    assert action_id in service._unpersisted_actions
+
+
+@pytest.mark.asyncio
+async def test_bad_report_is_dropped_without_losing_its_batch():
+    service = DecisionEngineService()
+    good = [service._next_action_id() for _ in range(3)]
+    bad = service._next_action_id()
+    committed = []
+
+    class Session:
+        def __init__(self):
+            self.pending = []
+
+        async def execute(self, stmt, rows):
+            if any(row["action_id"] == bad for row in rows):
+                raise ValueError("violates not-null constraint")
+            self.pending.extend(row["action_id"] for row in rows)
+
+        async def commit(self):
+            committed.extend(self.pending)
+            self.pending = []
+
+        async def rollback(self):
+            self.pending = []
+
+    for action_id in (*good, bad):
+        service._unpersisted_actions[action_id] = None
+    batch = [(action_id, "network_block", "completed", {}, {}) for action_id in (good[0], bad, *good[1:])]
+
+    assert await service._persist_batch(Session(), batch, MagicMock(invalidated=False)) is True
+    assert committed == good
+    assert bad in service._unpersisted_actions
+
+
+@pytest.mark.asyncio
+async def test_action_status_null_fields_are_defaulted():
+    service = DecisionEngineService()
+    report = {"action_id": "5f0c9a52-2f7a-4c55-9d6e-0b7f3f3c1a10", "action_type": None, "status": None,
+              "result_data": "oops", "evidence": None}
+    await service.handle_action_status(MagicMock(data=json.dumps(report).encode()))
+
+    assert service._status_q.get_nowait()[1:] == ("unknown", "unknown", {}, {})
@@ -0,0 +1,46 @@
+import pytest
+
+from n7_core.deployment import service as deployment
+from n7_core.deployment.service import DeploymentService
+
+
+class FakeConn:
+    def __init__(self, kwargs):
+        self.kwargs = kwargs
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_ssh_pool_keys_on_credential_and_defers_close(monkeypatch):
+    async def _connect(**kwargs):
+        return FakeConn(kwargs)
+
+    monkeypatch.setattr(deployment.asyncssh, "connect", _connect)
+    service = DeploymentService()
+    target = {"host": "10.0.0.7", "port": 22, "username": "root", "known_hosts": None}
+    try:
+        first = await service._get_ssh_conn({**target, "password": "right"})
+        shared = await service._get_ssh_conn({**target, "password": "right"})
+        other = await service._get_ssh_conn({**target, "password": "wrong"})
+        keyed = await service._get_ssh_conn({**target, "client_keys": ["/root/.ssh/id_ed25519"]})
+
+        assert shared is first
+        assert other is not first and other.kwargs["password"] == "wrong"
+        assert keyed not in (first, other)
+
+        # A transport error in one deploy evicts the connection, but the other
+        # deploy still using it keeps it open until it releases too.
+        service._drop_ssh_conn(first)
+        service._release_ssh_conn(first)
+        assert not first.closed
+        assert await service._get_ssh_conn({**target, "password": "right"}) is not first
+        service._release_ssh_conn(first)
+        assert first.closed
+    finally:
+        await service.stop()
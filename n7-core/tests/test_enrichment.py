@@ -0,0 +1,54 @@
+import pytest
+
+from n7_core.enrichment.service import EnrichmentService
+
+
+class FakeThreatIntel:
+    def __init__(self):
+        self.calls = 0
+
+    async def enrich_with_threat_intel(self, event_data):
+        self.calls += 1
+        return {"threat_intel_matches": [event_data.get("source_ip")]}
+
+
+@pytest.mark.asyncio
+async def test_threat_intel_lookup_is_cached_per_ioc_fields():
+    service = EnrichmentService()
+    intel = FakeThreatIntel()
+    service.set_threat_intel_service(intel)
+
+    first = await service.enrich_event({"raw_data": {"source_ip": "10.0.0.1", "pid": 1}})
+    second = await service.enrich_event({"raw_data": {"source_ip": "10.0.0.1", "pid": 2}})
+    other = await service.enrich_event({"raw_data": {"source_ip": "10.0.0.2"}})
+
+    assert first == second == {"threat_intel_matches": ["10.0.0.1"]}
+    assert other == {"threat_intel_matches": ["10.0.0.2"]}
+    assert intel.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_threat_intel_checks_all_iocs_in_one_mget(monkeypatch):
+    import orjson
+    from n7_core.threat_intel import service as threat_intel
+    from n7_core.threat_intel.service import ThreatIntelService
+
+    match = {"ioc_type": "ip", "ioc_value": "10.0.0.9", "confidence": 0.9}
+
+    class FakeRedis:
+        def __init__(self):
+            self.mget_calls = []
+
+        async def mget(self, keys):
+            self.mget_calls.append(keys)
+            return [orjson.dumps(match) if key == "n7:ioc:ip:10.0.0.9" else None for key in keys]
+
+    fake = FakeRedis()
+    monkeypatch.setattr(threat_intel, "get_redis_client", lambda: fake)
+
+    result = await ThreatIntelService().enrich_with_threat_intel(
+        {"source_ip": "10.0.0.1", "destination_ip": "10.0.0.9", "domain": "example.com"}
+    )
+
+    assert result == {"threat_intel_matches": [match]}
+    assert fake.mget_calls == [["n7:ioc:ip:10.0.0.1", "n7:ioc:ip:10.0.0.9", "n7:ioc:domain:example.com"]]
@@ -1,9 +1,47 @@
 import pytest
 import datetime
 import uuid
+
+import orjson
+
+from n7_core.event_pipeline import service as pipeline
 from n7_core.event_pipeline.service import EventPipelineService
 from schemas.events_pb2 import Event
 
+
+class MockMsg:
+    def __init__(self, data):
+        self.data = data
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """Pipeline with every event treated as new and NATS disconnected."""
+    service = EventPipelineService()
+
+    async def _not_duplicate(event_dict, size_hint=0):
+        return False
+
+    monkeypatch.setattr(service, "_is_duplicate", _not_duplicate)
+    monkeypatch.setattr(pipeline.nats_client, "nc", None)
+    return service
+
+
+@pytest.fixture
+def published(monkeypatch, service):
+    """Connect the pipeline to a fake NATS client; returns the (subject, payload) list it publishes."""
+    published = []
+
+    class FakeNC:
+        is_connected = True
+
+        async def publish(self, subject, payload):
+            published.append((subject, payload))
+
+    monkeypatch.setattr(pipeline.nats_client, "nc", FakeNC())
+    return published
+
+
 @pytest.mark.asyncio
 async def test_event_parsing():
     service = EventPipelineService()
@@ -18,10 +56,6 @@ async def test_event_parsing():
         raw_data='{"pid": 123}'
     )
     payload = event.SerializeToString()
-    
-    # Mock message
-    class MockMsg:
-        data = payload
         
     # We can't easily test handle_event without mocking DB/NATS fully, 
     # but we can check if it parses without error.
@@ -30,4 +64,217 @@ async def test_event_parsing():
     
     # Ideally we should mock logger and check calls, or mock DB session.
     # For now, just ensuring it runs without crashing on parse.
-    await service.handle_event(MockMsg())
+    await service.handle_event(MockMsg(payload))
+
+
+@pytest.mark.asyncio
+async def test_handle_event_buffers_copy_record(service):
+    sentinel_id = str(uuid.uuid4())
+    await service.handle_event(MockMsg(orjson.dumps({
+        "event_id": str(uuid.uuid4()),
+        "timestamp": "2024-01-01T00:00:00Z",
+        "sentinel_id": sentinel_id,
+        "event_class": "process",
+        "raw_data": {"pid": 123},
+    })))
+
+    assert len(service._buffer) == 1
+    record = service._buffer[0]
+    assert len(record) == len(pipeline._EVENT_COPY_COLUMNS)
+    assert record[1] == datetime.datetime(2024, 1, 1)
+    assert record[2] == uuid.UUID(sentinel_id)
+    assert orjson.loads(record[5]) == {"pid": 123}
+
+
+@pytest.mark.asyncio
+async def test_is_duplicate_uses_single_set_nx(monkeypatch):
+    class FakeRedis:
+        def __init__(self):
+            self.keys = set()
+            self.calls = 0
+
+        async def set(self, key, value, ex=None, nx=False):
+            self.calls += 1
+            assert nx and ex == 60
+            if key in self.keys:
+                return None
+            self.keys.add(key)
+            return True
+
+    fake = FakeRedis()
+    monkeypatch.setattr(pipeline, "get_redis_client", lambda: fake)
+    service = EventPipelineService()
+    event = {"sentinel_id": "s1", "event_class": "process", "raw_data": {"b": 1, "a": 2}}
+
+    assert await service._is_duplicate(event) is False
+    # Same content from another replica: the key exists in Redis but not locally
+    service._local_dedup.clear()
+    assert await service._is_duplicate(dict(event, raw_data={"a": 2, "b": 1})) is True
+    assert fake.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_locally_claimed_duplicate_skips_redis(monkeypatch):
+    calls = []
+
+    class FakeRedis:
+        async def set(self, key, value, ex=None, nx=False):
+            calls.append(key)
+            return True
+
+    monkeypatch.setattr(pipeline, "get_redis_client", lambda: FakeRedis())
+    service = EventPipelineService()
+    event = {"sentinel_id": "s1", "event_class": "heartbeat", "raw_data": {}}
+
+    assert await service._is_duplicate(event) is False
+    assert await service._is_duplicate(event) is True
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_handle_event_accepts_protobuf_payload(service):
+    event_id = str(uuid.uuid4())
+    await service.handle_event(MockMsg(Event(
+        event_id=event_id,
+        sentinel_id=str(uuid.uuid4()),
+        event_class="process",
+        severity="info",
+        raw_data='{"pid": 123}',
+    ).SerializeToString()))
+
+    assert len(service._buffer) == 1
+    assert service._buffer[0][0] == uuid.UUID(event_id)
+    assert service._buffer[0][5] == '{"pid":123}'
+
+
+@pytest.mark.asyncio
+async def test_full_batch_kicks_flusher_and_overflow_flushes_inline(monkeypatch, service):
+    service.FLUSH_BATCH_SIZE = 1
+    flushes = []
+
+    async def _fake_flush():
+        flushes.append(len(service._buffer))
+        service._buffer.clear()
+
+    monkeypatch.setattr(service, "_flush_buffer", _fake_flush)
+    monkeypatch.setattr(pipeline, "_MAX_BUFFER_BATCHES", 2)
+    msg = MockMsg(orjson.dumps({"event_id": str(uuid.uuid4()), "raw_data": {}}))
+
+    await service.handle_event(msg)
+    assert service._flush_kick.is_set()
+    assert flushes == []
+
+    await service.handle_event(msg)
+    assert flushes == [2]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_dropped_before_normalisation(monkeypatch):
+    service = EventPipelineService()
+
+    async def _duplicate(event_dict, size_hint=0):
+        return True
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("timestamp parsed for a duplicate")
+
+    monkeypatch.setattr(service, "_is_duplicate", _duplicate)
+    monkeypatch.setattr(pipeline, "_parse_iso", _fail)
+
+    await service.handle_event(MockMsg(orjson.dumps({"timestamp": "2024-01-01T00:00:00Z", "raw_data": "{}"})))
+
+    assert service._buffer == []
+
+
+@pytest.mark.asyncio
+async def test_malformed_ids_are_replaced(service):
+    await service.handle_event(MockMsg(orjson.dumps({"event_id": "not-a-uuid", "sentinel_id": 42, "raw_data": {}})))
+
+    record = service._buffer[0]
+    assert isinstance(record[0], uuid.UUID)
+    assert record[2] == pipeline._NIL_UUID
+
+
+@pytest.mark.asyncio
+async def test_forwarded_event_reuses_proto_message(service, published):
+    proto = service._proto_event
+
+    for event_class in ("process", "network"):
+        await service.handle_event(MockMsg(orjson.dumps({"event_class": event_class, "raw_data": {"n": 1}})))
+
+    assert service._proto_event is proto
+    decoded = [Event.FromString(payload) for _, payload in published]
+    assert [e.event_class for e in decoded] == ["process", "network"]
+    assert decoded[1].raw_data == '{"n":1}'
+
+
+@pytest.mark.asyncio
+async def test_protobuf_event_forwarded_without_reencoding_raw_data(service, published):
+    inbound = Event(
+        event_id="not-a-uuid",
+        sentinel_id=str(uuid.uuid4()),
+        event_class="process",
+        severity="info",
+        raw_data='{"pid": 123}',
+    ).SerializeToString()
+
+    await service.handle_event(MockMsg(inbound))
+
+    _, payload = published[0]
+    assert payload.startswith(inbound)
+    forwarded = Event.FromString(payload)
+    assert forwarded.raw_data == '{"pid": 123}'
+    assert forwarded.event_id != "not-a-uuid"
+    assert uuid.UUID(forwarded.event_id) == service._buffer[0][0]
+    assert forwarded.enrichments == "{}"
+
+
+@pytest.mark.asyncio
+async def test_duplicate_event_id_in_copy_batch_falls_back_to_insert(monkeypatch):
+    from asyncpg.exceptions import UniqueViolationError
+
+    calls = []
+
+    class Driver:
+        async def copy_records_to_table(self, table, records, columns):
+            calls.append("copy")
+            raise UniqueViolationError('duplicate key value violates unique constraint "events_pkey"')
+
+        async def executemany(self, sql, records):
+            calls.append(("insert", sql, len(records)))
+
+    class Session:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+        async def connection(self):
+            class Conn:
+                async def get_raw_connection(self):
+                    return type("PoolProxiedConnection", (), {"driver_connection": Driver()})()
+
+            return Conn()
+
+        async def rollback(self):
+            calls.append("rollback")
+
+        async def commit(self):
+            calls.append("commit")
+
+    monkeypatch.setattr(pipeline, "async_session_maker", Session)
+    monkeypatch.setattr(pipeline.nats_client, "nc", None)
+    service = EventPipelineService()
+    now = datetime.datetime(2024, 1, 1)
+    records = [
+        (uuid.uuid4(), now, pipeline._NIL_UUID, "process", "info", "{}", "{}", "[]")
+        for _ in range(pipeline._COPY_THRESHOLD)
+    ]
+    records.append(records[0])  # redelivered event
+    service._buffer = records
+
+    await service._flush_buffer()
+
+    assert calls == ["copy", "rollback", ("insert", pipeline._EVENT_INSERT_SQL, len(records)), "commit"]
+    assert "ON CONFLICT DO NOTHING" in pipeline._EVENT_INSERT_SQL
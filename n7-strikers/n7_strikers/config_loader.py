@@ -4,9 +4,11 @@ Remote config loader for N7 agents.
 On startup the agent calls GET {CORE_API_URL}/agents/{agent_id}/config with its API key.
 CORE_API_URL already includes the versioned prefix (e.g. http://host:8000/api/v1).
 Core responds with config values where the two sensitive fields (nats_url_enc,
-core_api_url_enc) are Fernet-encrypted using a key derived from the agent's own
+core_api_url_enc) are encrypted using a key derived from the agent's own
 API key.  The agent decrypts them locally using the same derivation:
-    key = base64url(sha256(api_key))
+    transport_cipher == "aes-256-gcm":  key = sha256(api_key),
+                                        token = base64url(nonce[12] || ciphertext)
+    otherwise (older Core, Fernet):     key = base64url(sha256(api_key))
 
 All other fields are returned as plaintext.
 """
@@ -17,15 +19,34 @@ from typing import Optional
 
 import aiohttp
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 logger = logging.getLogger("n7-striker.config-loader")
 
 
+_GCM_NONCE_BYTES = 12
+
+
 def _derive_fernet_key(secret: str) -> bytes:
     digest = hashlib.sha256(secret.encode()).digest()
     return base64.urlsafe_b64encode(digest)
 
 
+def _transport_decryptor(api_key: str, cipher: Optional[str]):
+    """Return a token -> plaintext callable for the transport cipher Core used."""
+    if cipher == "aes-256-gcm":
+        aead = AESGCM(hashlib.sha256(api_key.encode()).digest())
+
+        def decrypt(token: str) -> str:
+            raw = base64.urlsafe_b64decode(token)
+            return aead.decrypt(raw[:_GCM_NONCE_BYTES], raw[_GCM_NONCE_BYTES:], None).decode()
+
+        return decrypt
+
+    fernet = Fernet(_derive_fernet_key(api_key))
+    return lambda token: fernet.decrypt(token.encode()).decode()
+
+
 async def fetch_remote_config(
     core_api_url: str,
     agent_id: str,
@@ -58,19 +79,19 @@ async def fetch_remote_config(
             data = await resp.json()
 
         # Decrypt the two sensitive fields using the agent's own key
-        fernet = Fernet(_derive_fernet_key(api_key))
         config = dict(data)
+        decrypt = _transport_decryptor(api_key, config.pop("transport_cipher", None))
 
         if config.get("nats_url_enc"):
             try:
-                config["nats_url"] = fernet.decrypt(config["nats_url_enc"].encode()).decode()
+                config["nats_url"] = decrypt(config["nats_url_enc"])
             except Exception as e:
                 logger.error(f"Failed to decrypt nats_url: {e}")
                 config["nats_url"] = None
 
         if config.get("core_api_url_enc"):
             try:
-                config["core_api_url"] = fernet.decrypt(config["core_api_url_enc"].encode()).decode()
+                config["core_api_url"] = decrypt(config["core_api_url_enc"])
             except Exception as e:
                 logger.error(f"Failed to decrypt core_api_url: {e}")
                 config["core_api_url"] = None